@@ -0,0 +1,5 @@
+"""Shared building blocks for the asciiSpirals animations.
+
+The scripts in this repo stay runnable on their own; this package holds the
+pieces several of them need (geometry caches, screen output, colors, ...).
+"""
@@ -0,0 +1,69 @@
+"""
+One launcher for every effect.
+
+    python -m asciifx EFFECT [options]   run one effect (options as for its script)
+    python -m asciifx --list             list the effects
+    python -m asciifx --ttff [--headless=120x50]
+                                         time to first frame of every effect,
+                                         each in a fresh interpreter
+
+Only the selected effect is imported.  On exit the launcher reports how
+long the import took and how long until the first frame was finished,
+both counted from the launcher's start.
+"""
+
+import re
+import subprocess
+import sys
+import time
+
+from asciifx.registry import EFFECTS, load
+from asciifx.session import parse_options, session_from_argv
+
+STARTUP = re.compile(r"^(\S+): import ([\d.]+) ms, first frame ([\d.]+) ms$", re.M)
+
+
+def run(name, started):
+    entry = load(name)
+    imported = time.perf_counter()
+    session = session_from_argv()
+    entry(session=session)
+    first = session.first_frame
+    first_ms = f"{(first - started) * 1000:.1f}" if first else "-"
+    print(f"{name}: import {(imported - started) * 1000:.1f} ms, first frame {first_ms} ms",
+          file=sys.stderr)
+
+
+def time_to_first_frame(size):
+    print(f"{'effect':<12}{'import ms':>11}{'first frame ms':>16}")
+    for name in EFFECTS:
+        proc = subprocess.run([sys.executable, "-m", "asciifx", name, f"--headless={size}",
+                               "--frames=1"], capture_output=True, text=True)
+        match = STARTUP.search(proc.stderr)
+        if match is None:
+            print(f"{name:<12}{'failed':>11}")
+            continue
+        print(f"{name:<12}{float(match.group(2)):>11.1f}{float(match.group(3)):>16.1f}", flush=True)
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    argv = sys.argv[1:] if argv is None else argv
+    names = [a for a in argv if not a.startswith("-")]
+    if "--list" in argv:
+        for name, (_, _, description) in EFFECTS.items():
+            print(f"{name:<12}{description}")
+        return 0
+    if "--ttff" in argv:
+        time_to_first_frame(parse_options(argv).get("headless", "120x50"))
+        return 0
+    if len(names) != 1 or names[0] not in EFFECTS:
+        print(__doc__.strip(), file=sys.stderr)
+        print("\neffects: " + ", ".join(EFFECTS), file=sys.stderr)
+        return 2
+    run(names[0], started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+The vortex art shared by inferno and tiedye, and scaling it to a terminal.
+
+The art ships precompiled in vortex.art: a header line
+
+    asciiart W0 H0 W1 H1 ...
+
+followed by the rows of every level back to back, one byte per cell,
+already padded.  Level 0 is the art itself; each further level halves it,
+averaging 2x2 blocks on the density ramp below so thin strokes survive
+instead of falling between sampled cells.  Loading is a read and a few
+slices, with no parsing.
+
+scale_art() picks the smallest level that still covers the target size (the
+art itself when enlarging, where nearest-neighbor sampling is exact) and
+gathers the target cells from it through index arrays; rows that come
+from the same source row are built once.
+
+    python -m asciifx.art compile SRC.txt [OUT]   rebuild vortex.art from text
+    python -m asciifx.art show [LEVEL]            print a level
+"""
+
+import os
+import sys
+from functools import lru_cache
+from operator import itemgetter
+
+VORTEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vortex.art")
+RAMP = " .:-=+*#%@"  # light to dense
+MIN_LEVEL = 16  # stop halving below this width
+
+
+def halve(rows):
+    # one pyramid level down: each 2x2 block becomes its mean density
+    density = {ch: i for i, ch in enumerate(RAMP)}
+    h, w = len(rows) // 2, len(rows[0]) // 2
+    out = []
+    for y in range(h):
+        a, b = rows[2 * y], rows[2 * y + 1]
+        line = []
+        for x in range(w):
+            cells = (a[2 * x], a[2 * x + 1], b[2 * x], b[2 * x + 1])
+            total = sum(density.get(c, len(RAMP) - 1) for c in cells)
+            line.append(RAMP[int(total / 4 + 0.5)])
+        out.append("".join(line))
+    return out
+
+
+def compile_art(text):
+    # source text -> vortex.art bytes; ragged lines are padded with spaces
+    lines = [line for line in text.splitlines() if line.strip("\n") != ""]
+    width = max(len(line) for line in lines)
+    levels = [[line.ljust(width) for line in lines]]
+    while len(levels[-1][0]) // 2 >= MIN_LEVEL:
+        levels.append(halve(levels[-1]))
+    header = "asciiart " + " ".join(f"{len(rows[0])} {len(rows)}" for rows in levels)
+    body = "".join("".join(rows) for rows in levels)
+    return (header + "\n" + body).encode("ascii")
+
+
+@lru_cache(maxsize=4)
+def load_art(path=VORTEX):
+    # the levels, largest first, each a tuple of row strings
+    with open(path, "rb") as f:
+        header = f.readline().split()
+        data = f.read().decode("ascii")
+    if header[0] != b"asciiart":
+        raise ValueError(f"{path}: not an asciiart file")
+    dims = [int(v) for v in header[1:]]
+    levels, offset = [], 0
+    for w, h in zip(dims[::2], dims[1::2]):
+        levels.append(tuple(data[offset + y * w:offset + (y + 1) * w] for y in range(h)))
+        offset += w * h
+    return tuple(levels)
+
+
+def sample(n, size, rounding):
+    # nearest-neighbor source index for each of n target positions
+    last = float(max(1, n - 1))
+    if rounding == "round":
+        return [int(round(i / last * (size - 1))) for i in range(n)]
+    return [int(i / last * (size - 1)) for i in range(n)]
+
+
+def _level_for(levels, width, height):
+    for rows in reversed(levels):
+        if len(rows[0]) >= width and len(rows) >= height:
+            return rows
+    return levels[0]
+
+
+@lru_cache(maxsize=8)
+def scale_art(width, height, rounding="round", path=VORTEX):
+    """The art as height row strings of width characters.
+
+    rounding picks how a target cell maps to a source cell: "round" to the
+    nearest, "floor" to the one below (tiedye's original sampling).
+    """
+    rows = _level_for(load_art(path), width, height)
+    xs = sample(width, len(rows[0]), rounding)
+    gather = itemgetter(*xs) if width > 1 else (lambda row: (row[xs[0]],))
+    built = {}
+    out = []
+    for sy in sample(height, len(rows), rounding):
+        line = built.get(sy)
+        if line is None:
+            line = built[sy] = "".join(gather(rows[sy]))
+        out.append(line)
+    return tuple(out)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compile"] and len(argv) in (2, 3):
+        with open(argv[1]) as f:
+            data = compile_art(f.read())
+        with open(argv[2] if len(argv) == 3 else VORTEX, "wb") as f:
+            f.write(data)
+        return 0
+    if argv[:1] == ["show"]:
+        levels = load_art()
+        print("\n".join(levels[int(argv[1]) if len(argv) > 1 else 0]))
+        return 0
+    print(__doc__.strip(), file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
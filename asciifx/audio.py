@@ -0,0 +1,269 @@
+"""
+Audio-reactive input.
+
+AudioInput reads PCM from a WAV file, a raw file, a FIFO or stdin and turns
+it into four smoothed levels between 0 and 1: bass (20-250 Hz), mid
+(250-2000 Hz), treble (2000 Hz and up) and the overall level.  The loop
+calls update(now) once per frame and reads the attributes; map() scales
+one of them into a parameter range.
+
+Files (WAV or raw) are read on demand, as far as the session clock has
+got, so a headless run with a WAV file is repeatable frame for frame.
+stdin and FIFOs are read by a daemon thread into a ring buffer; update()
+only analyzes the newest window and never waits for data.  The analysis
+is a Hann-windowed FFT over the last 1024 samples (numpy); without numpy
+all four levels follow the RMS loudness.
+
+    --audio=song.wav          WAV file (any rate, channels, 8/16/32 bit)
+    --audio=-                 raw PCM on stdin (signed 16-bit little-endian)
+    --audio=/tmp/fifo         raw PCM from a FIFO or file
+    --audio-rate=44100        sample rate of raw input
+    --audio-channels=1        channels of raw input
+
+    python -m asciifx.audio FILE.wav [--fps=30]    print the levels over time
+    python -m asciifx.audio --fixture=beats.wav    write a test signal
+"""
+
+import array
+import math
+import os
+import stat
+import sys
+import threading
+import time
+import wave
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # optional: RMS loudness only
+    np = None
+
+WINDOW = 1024  # samples per analysis
+BANDS = {"bass": (20, 250), "mid": (250, 2000), "treble": (2000, None)}
+ATTACK = 0.02   # seconds to follow a rise
+RELEASE = 0.25  # seconds to follow a fall
+PEAK_DECAY = 0.5  # fraction of the running peak kept per 10 s
+FLOOR = 0.01    # peaks below this (-40 dBFS) count as silence
+
+
+def decode(data, width, channels):
+    # interleaved PCM bytes -> mono samples in [-1, 1]
+    if width == 1:
+        fmt, offset, scale = "B", 128, 128.0
+    else:
+        fmt, offset, scale = {2: "h", 4: "i"}[width], 0, float(2 ** (8 * width - 1))
+    if np is not None:
+        kind = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}[width]
+        samples = (np.frombuffer(data, kind).astype(np.float32) - offset) / scale
+        return samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+    samples = array.array(fmt, data)
+    if width > 1 and sys.byteorder == "big":
+        samples.byteswap()
+    mono = [(s - offset) / scale for s in samples]
+    if channels > 1:
+        mono = [sum(mono[i:i + channels]) / channels for i in range(0, len(mono), channels)]
+    return mono
+
+
+class AudioInput:
+    bass = mid = treble = level = 0.0
+
+    def __init__(self, source, rate=44100, channels=1, width=2, window=WINDOW):
+        self.source = source
+        self.rate, self.channels, self.width = rate, channels, width
+        self.window = window
+        self.file = None
+        self.wav = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.samples_read = 0
+        self.peaks = dict.fromkeys(BANDS, FLOOR)
+        self.peaks["level"] = FLOOR
+        self.last = None
+        if np is not None:
+            self.ring = np.zeros(window, np.float32)
+            self.hann = np.hanning(window).astype(np.float32)
+        else:
+            self.ring = deque([0.0] * window, maxlen=window)
+        self._open()
+        if np is not None:
+            freqs = np.fft.rfftfreq(window, 1.0 / self.rate)
+            self.bins = {name: (freqs >= lo) & (freqs < (hi or self.rate)) for name, (lo, hi) in BANDS.items()}
+
+    def _open(self):
+        if self.source == "-":
+            self._start_reader(lambda: sys.stdin.buffer)
+        elif self.source.lower().endswith(".wav"):
+            self.wav = wave.open(self.source, "rb")
+            self.rate, self.channels = self.wav.getframerate(), self.wav.getnchannels()
+            self.width = self.wav.getsampwidth()
+        elif stat.S_ISFIFO(os.stat(self.source).st_mode):
+            # opening a FIFO waits for a writer: do that on the reader thread too
+            self._start_reader(lambda: open(self.source, "rb", buffering=0))
+        else:
+            self.file = open(self.source, "rb")
+
+    # streamed input (stdin, FIFO): a daemon thread fills the ring buffer
+    def _start_reader(self, opener):
+        self.thread = threading.Thread(target=self._read_stream, args=(opener,),
+                                       name="audio-reader", daemon=True)
+        self.thread.start()
+
+    def _read_stream(self, opener):
+        stream = opener()
+        frame = self.width * self.channels
+        rest = b""
+        while True:
+            data = stream.read(frame * 256)
+            if not data:
+                return  # end of input: the levels fall back to silence
+            data = rest + data
+            cut = len(data) - len(data) % frame
+            rest = data[cut:]
+            with self.lock:
+                self._push(decode(data[:cut], self.width, self.channels))
+
+    def _push(self, samples):
+        n = len(samples)
+        self.samples_read += n
+        if n == 0:
+            return
+        if np is None:
+            self.ring.extend(samples)
+            return
+        if n >= self.window:
+            self.ring[:] = samples[-self.window:]
+        else:
+            self.ring[:-n] = self.ring[n:]
+            self.ring[-n:] = samples
+
+    # file input: read up to the session clock
+    def _read_file(self, now):
+        due = int(now * self.rate) - self.samples_read
+        if due <= 0:
+            return
+        skip = max(0, due - self.window)  # older samples would only be overwritten
+        if self.wav:
+            if skip:
+                self.wav.setpos(min(self.wav.getnframes(), self.wav.tell() + skip))
+            data = self.wav.readframes(due - skip)
+        else:
+            frame = self.width * self.channels
+            if skip:
+                self.file.seek(skip * frame, os.SEEK_CUR)
+            data = self.file.read((due - skip) * frame)
+            data = data[:len(data) - len(data) % frame]
+        self.samples_read += skip
+        # past the end: silence
+        samples = decode(data, self.width, self.channels) if data else []
+        missing = due - skip - len(samples)
+        if missing > 0:
+            samples = list(samples) + [0.0] * missing
+            if np is not None:
+                samples = np.asarray(samples, np.float32)
+        self._push(samples)
+
+    def _measure(self):
+        # raw (unsmoothed) band amplitudes of the newest window, about 1.0
+        # for a full-scale sine
+        if np is None:
+            with self.lock:
+                power = sum(s * s for s in self.ring)
+            rms = math.sqrt(power / self.window) * math.sqrt(2)
+            return dict.fromkeys(("bass", "mid", "treble", "level"), rms)
+        with self.lock:
+            spectrum = np.abs(np.fft.rfft(self.ring * self.hann)) ** 2
+        scale = self.window / 4  # a full-scale sine's peak bin under the Hann window
+        levels = {name: math.sqrt(float(spectrum[mask].sum())) / scale for name, mask in self.bins.items()}
+        levels["level"] = math.sqrt(float(spectrum.sum())) / scale
+        return levels
+
+    def update(self, now):
+        """Bring the levels up to time now (seconds on the session clock)."""
+        if self.wav or self.file:
+            self._read_file(now)
+        dt = 0.0 if self.last is None else max(0.0, now - self.last)
+        self.last = now
+        decay = PEAK_DECAY ** (dt / 10.0)
+        for name, raw in self._measure().items():
+            # relative to the loudest recent value, then smoothed
+            peak = self.peaks[name] = max(raw, self.peaks[name] * decay, FLOOR)
+            target = min(1.0, raw / peak)
+            value = getattr(self, name)
+            tau = ATTACK if target > value else RELEASE
+            alpha = 1.0 - math.exp(-dt / tau) if dt else 1.0
+            setattr(self, name, value + (target - value) * alpha)
+
+    def map(self, name, low, high):
+        # one level scaled into [low, high]
+        return low + (high - low) * getattr(self, name)
+
+    def close(self):
+        if self.wav:
+            self.wav.close()
+        if self.file:
+            self.file.close()
+        # the reader thread is a daemon; it may be blocked in read()
+
+
+def audio_from_options(opts):
+    # an AudioInput for --audio=SRC, else None
+    source = opts.get("audio")
+    if not source:
+        return None
+    return AudioInput(source, int(opts.get("audio-rate", 44100)), int(opts.get("audio-channels", 1)))
+
+
+def write_fixture(path, seconds=4.0, rate=44100):
+    # a test signal: a 60 Hz kick on every beat (120 bpm), a 4 kHz tick
+    # on the off-beats, and a 440 Hz tone in the second half
+    frames = array.array("h")
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        beat = t % 0.5
+        s = math.sin(2 * math.pi * 60 * t) * math.exp(-beat * 12)
+        off = (t + 0.25) % 0.5
+        s += 0.4 * math.sin(2 * math.pi * 4000 * t) * math.exp(-off * 60)
+        if t >= seconds / 2:
+            s += 0.3 * math.sin(2 * math.pi * 440 * t)
+        frames.append(int(max(-1.0, min(1.0, s * 0.6)) * 32767))
+    if sys.byteorder == "big":
+        frames.byteswap()
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(frames.tobytes())
+
+
+def main(argv=None):
+    from asciifx.session import parse_options
+
+    argv = sys.argv[1:] if argv is None else argv
+    opts = parse_options(argv)
+    if "fixture" in opts:
+        write_fixture(opts["fixture"])
+        return 0
+    paths = [a for a in argv if not a.startswith("--")]
+    if len(paths) != 1:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    fps = float(opts.get("fps", 30))
+    audio = AudioInput(paths[0])
+    duration = audio.wav.getnframes() / audio.rate if audio.wav else 10.0
+    print(f"{'t':>6}{'bass':>7}{'mid':>7}{'treble':>7}{'level':>7}")
+    cost, n = 0.0, 0
+    while n / fps <= duration:
+        started = time.perf_counter()
+        audio.update(n / fps)
+        cost += time.perf_counter() - started
+        print(f"{n / fps:>6.2f}{audio.bass:>7.2f}{audio.mid:>7.2f}{audio.treble:>7.2f}{audio.level:>7.2f}")
+        n += 1
+    audio.close()
+    print(f"update: {cost / max(1, n) * 1000:.3f} ms per frame", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
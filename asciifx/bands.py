@@ -0,0 +1,203 @@
+"""
+Row-band rendering on a pool of worker processes.
+
+inferno and tiedye compute every cell of a frame independently, so at
+large sizes the frame can be split into horizontal bands, one per worker.
+Each worker is a persistent process: it receives the effect's state once
+(again after a resize), and per frame only render()'s argument, such as
+the time.  It rasterizes and
+encodes its band and copies the text into its slot of a shared memory
+block; the main process joins the bands and writes the frame.  Only the
+lengths travel back through the pipes.
+
+A band is encoded on its own, so it starts without an active color and
+ends with a reset; on screen that is the same frame.
+
+    --workers=N      render on N worker processes (0: in-process, default)
+    --workers=auto   one worker per available core
+
+The scaling benchmark runs inferno and tiedye on 1, 2, 4 and 8 workers:
+
+    python -m asciifx.bands [--sizes=400x120] [--frames=50]
+                            [--workers=0,1,2,4,8] [--only=inferno]
+"""
+
+import multiprocessing as mp
+import os
+import signal
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+BYTES_PER_CELL = 24  # glyph plus the longest truecolor escape, with room
+
+
+def cpu_count():
+    # cores this process may run on, not the machine's total
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def split_rows(height, bands):
+    # (y0, y1) per band, sizes differing by at most one row
+    bands = max(1, min(bands, height))
+    base, extra = divmod(height, bands)
+    spans, y = [], 0
+    for i in range(bands):
+        step = base + (1 if i < extra else 0)
+        spans.append((y, y + step))
+        y += step
+    return spans
+
+
+def _worker(conn, render_band):
+    # the main process handles Ctrl+C and stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = state = None
+    y0 = y1 = offset = capacity = 0
+    try:
+        while True:
+            msg = conn.recv()
+            if msg[0] == "stop":
+                break
+            if msg[0] == "setup":
+                _, state, name, offset, capacity, y0, y1 = msg
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=name)
+                continue
+            try:
+                data = render_band(state, msg[1], y0, y1).encode()
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+                continue
+            if len(data) > capacity:  # should not happen; send it the slow way
+                conn.send(("text", data))
+                continue
+            shm.buf[offset:offset + len(data)] = data
+            conn.send(("shm", len(data)))
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+class BandPool:
+    """Persistent workers calling render_band(state, frame, y0, y1) -> encoded rows.
+
+    render_band must be a module-level function.  setup() hands out the
+    state and the band split; render(frame) returns the bands' text in order.
+    """
+
+    def __init__(self, render_band, workers):
+        # fork where there is one: the effect module need not be importable
+        # by name (the launcher and benchmark load it from its path)
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context("fork" if "fork" in methods else None)
+        # one resource tracker for everyone, or each worker would start its
+        # own and "clean up" the shared memory when it exits
+        if os.name == "posix":
+            resource_tracker.ensure_running()
+        self.workers = []
+        for i in range(workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child, render_band),
+                               name=f"band-{i}", daemon=True)
+            proc.start()
+            child.close()
+            self.workers.append((proc, parent))
+        self.shm = None
+        self.slots = []  # (offset, y0, y1) per band in use
+
+    def __len__(self):
+        return len(self.workers)
+
+    def setup(self, state, width, height):
+        spans = split_rows(height, len(self.workers))
+        sizes = [(y1 - y0) * (width * BYTES_PER_CELL + 1) for y0, y1 in spans]
+        old = self.shm
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, sum(sizes)))
+        self.slots = []
+        offset = 0
+        for (y0, y1), size, (_, conn) in zip(spans, sizes, self.workers):
+            conn.send(("setup", state, self.shm.name, offset, size, y0, y1))
+            self.slots.append((offset, y0, y1))
+            offset += size
+        if old is not None:  # the workers let go of it before their next frame
+            old.close()
+            old.unlink()
+
+    def render(self, frame):
+        conns = [conn for _, conn in self.workers[:len(self.slots)]]
+        for conn in conns:
+            conn.send(("frame", frame))
+        bands = []
+        for (offset, _, _), conn in zip(self.slots, conns):
+            kind, value = conn.recv()
+            if kind == "error":
+                raise RuntimeError(f"band worker failed: {value}")
+            if kind == "text":
+                bands.append(value.decode())
+            else:
+                bands.append(bytes(self.shm.buf[offset:offset + value]).decode())
+        return bands
+
+    def close(self):
+        for proc, conn in self.workers:
+            try:
+                conn.send(("stop",))
+            except OSError:
+                pass
+        for proc, conn in self.workers:
+            proc.join(1.0)
+            if proc.is_alive():
+                proc.terminate()
+            conn.close()
+        self.workers = []
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pool_for(session, render_band):
+    # a BandPool for --workers=N|auto, None to render in-process
+    value = session.options.get("workers", "0")
+    workers = cpu_count() if value == "auto" else int(value)
+    if workers < 1:
+        return None
+    return BandPool(render_band, workers)
+
+
+def main(argv=None):
+    from asciifx.bench import run_one
+    from asciifx.session import parse_options
+
+    opts = parse_options(sys.argv[1:] if argv is None else argv)
+    sizes = [tuple(int(v) for v in s.lower().split("x"))
+             for s in opts.get("sizes", "400x120").split(",")]
+    counts = [int(n) for n in opts.get("workers", "0,1,2,4,8").split(",")]
+    names = opts.get("only", "inferno,tiedye").split(",")
+    frames = int(opts.get("frames", 50))
+
+    print(f"{cpu_count()} cores available")
+    print(f"{'animation':<18}{'workers':>8}{'fps':>9}{'p50 ms':>9}{'speedup':>9}")
+    for name in names:
+        for width, height in sizes:
+            key = f"{name}@{width}x{height}"
+            base = None
+            for n in counts:
+                r = run_one(name, width, height, frames, 1234, {"workers": str(n)})
+                base = base or r["p50_ms"]
+                print(f"{key:<18}{n:>8}{r['fps']:>9.1f}{r['p50_ms']:>9.2f}"
+                      f"{base / r['p50_ms'] if r['p50_ms'] else 0:>8.2f}x", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
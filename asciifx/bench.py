@@ -0,0 +1,112 @@
+"""
+Benchmark every animation at fixed terminal sizes.
+
+Each animation's own loop runs under a quiet HeadlessSession (see
+asciifx.session) for a fixed number of frames, so a frame is timed with
+its simulation step, rasterization, encoding and write to a null sink.
+The random module is seeded before every run; the numpy particle fields
+and the asciifx.rng generators seed themselves from it.
+
+    python -m asciifx.bench [--sizes=80x24,200x60,400x120] [--frames=100]
+                            [--only=golden,spiral4] [--seed=1234]
+                            [--out=bench.json] [--baseline=bench.json]
+                            [--threshold=0.15]
+
+With --baseline, a run whose median frame time or bytes per frame is more
+than threshold worse than the stored result counts as a regression, and
+the exit status is 1.
+"""
+
+import json
+import platform
+import random
+import sys
+import time
+
+from asciifx.registry import EFFECTS, load_fresh
+from asciifx.session import HeadlessSession, parse_options
+
+SIZES = ((80, 24), (200, 60), (400, 120))
+
+
+def percentile(sorted_values, p):
+    # nearest rank
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def run_one(name, width, height, frames, seed, options=None):
+    random.seed(seed)
+    entry = load_fresh(name)  # no caches or buffers carried over
+    session = HeadlessSession(width, height, frames, quiet=True)
+    session.options = dict(options or {})  # as if given as --key=value
+    entry(session=session)
+    times = sorted(session.frame_times)
+    count = len(times)
+    return {
+        "frames": count,
+        "fps": count / session.elapsed if session.elapsed > 0 else 0.0,
+        "p50_ms": percentile(times, 50) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "bytes_per_frame": session.sink.bytes / count if count else 0.0,
+    }
+
+
+def compare(results, baseline, threshold):
+    # regressions as (key, metric, baseline value, new value)
+    regressions = []
+    for key, new in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in ("p50_ms", "bytes_per_frame"):
+            if old[metric] > 0 and new[metric] > old[metric] * (1 + threshold):
+                regressions.append((key, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main(argv=None):
+    opts = parse_options(sys.argv[1:] if argv is None else argv)
+    sizes = SIZES
+    if "sizes" in opts:
+        sizes = [tuple(int(v) for v in s.lower().split("x")) for s in opts["sizes"].split(",")]
+    names = opts["only"].split(",") if "only" in opts else list(EFFECTS)
+    frames = int(opts.get("frames", 100))
+    seed = int(opts.get("seed", 1234))
+    threshold = float(opts.get("threshold", 0.15))
+
+    results = {}
+    print(f"{'animation':<18}{'fps':>9}{'p50 ms':>9}{'p99 ms':>9}{'bytes/frame':>13}")
+    for name in names:
+        for width, height in sizes:
+            key = f"{name}@{width}x{height}"
+            r = results[key] = run_one(name, width, height, frames, seed)
+            print(f"{key:<18}{r['fps']:>9.1f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                  f"{r['bytes_per_frame']:>13.0f}", flush=True)
+
+    if "out" in opts:
+        report = {
+            "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "frames": frames, "seed": seed, "time": int(time.time())},
+            "results": results,
+        }
+        with open(opts["out"], "w") as f:
+            json.dump(report, f, indent=2)
+
+    if "baseline" in opts:
+        with open(opts["baseline"]) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, threshold)
+        for key, metric, old, new in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.2f} -> {new:.2f} "
+                  f"(+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
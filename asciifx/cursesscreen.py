@@ -0,0 +1,121 @@
+"""
+Damage-tracked output for curses windows.
+
+Erasing the window and addch()-ing every cell costs width*height curses
+calls per frame, although particles cover a small part of the screen.
+CursesScreen keeps the cells it drew last frame (position -> (glyph,
+color pair)) and per frame only
+
+  - blanks the cells that were vacated, and
+  - draws the cells that are new or changed,
+
+both as runs: neighbouring cells of a row with the same pair go out in one
+addstr().  The window is then pushed with noutrefresh() + doupdate().
+A resize clears the window and starts over.
+
+full=True (--full-redraw) is the old way, erase() and one addch() per
+cell, for comparison.  summary() reports curses calls and cells drawn per
+frame; with stats=True (--stats) also the bytes the process wrote per
+frame, where /proc/self/io can tell (Linux); that file is read once per
+frame, so without stats it is left alone.
+"""
+
+import curses
+
+
+def _written():
+    # bytes written by this process so far, None where unknown
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class CursesScreen:
+    def __init__(self, full=False, stats=False):
+        self.full = full
+        self.stats = stats
+        self.prev = {}  # y * width + x -> (glyph, pair) on screen
+        self.size = None
+        self.frames = 0
+        self.calls = 0
+        self.cells = 0
+        self.bytes = 0
+        self._mark = None
+
+    def draw(self, stdscr, cells, width, height):
+        """Bring the window to cells: {y * width + x: (glyph, pair)}, all on screen."""
+        if self.stats and self._mark is None:
+            self._mark = _written()
+        if self.full:
+            self._draw_full(stdscr, cells, width, height)
+            return
+        if (width, height) != self.size:
+            self.size = (width, height)
+            self.prev = {}
+            stdscr.clear()
+            self.calls += 1
+        prev = self.prev
+        damage = {pos: (" ", 0) for pos in prev.keys() - cells.keys()}
+        for pos, cell in cells.items():
+            if prev.get(pos) != cell:
+                damage[pos] = cell
+        self.prev = cells
+        self.cells += len(damage)
+
+        # contiguous same-pair runs, row by row
+        run, start, pair = [], -2, None
+        for pos in sorted(damage):
+            glyph, p = damage[pos]
+            if pos == start + len(run) and p == pair and pos % width:
+                run.append(glyph)
+                continue
+            if run:
+                self._addstr(stdscr, start, run, pair, width)
+            run, start, pair = [glyph], pos, p
+        if run:
+            self._addstr(stdscr, start, run, pair, width)
+
+    def _addstr(self, stdscr, start, run, pair, width):
+        y, x = divmod(start, width)
+        self.calls += 1
+        try:
+            stdscr.addstr(y, x, "".join(run), curses.color_pair(pair))
+        except curses.error:
+            pass  # the bottom-right cell: drawn, but the cursor cannot advance
+
+    def _draw_full(self, stdscr, cells, width, height):
+        stdscr.erase()
+        blank = (" ", 0)
+        for y in range(height):
+            row = y * width
+            for x in range(width):
+                glyph, pair = cells.get(row + x, blank)
+                try:
+                    stdscr.addch(y, x, glyph, curses.color_pair(pair))
+                except curses.error:
+                    pass
+        self.calls += 1 + width * height
+        self.cells += width * height
+
+    def refresh(self, stdscr):
+        stdscr.noutrefresh()
+        curses.doupdate()
+        self.calls += 2
+        self.frames += 1
+        if self._mark is not None:
+            written = _written()
+            self.bytes += written - self._mark
+            self._mark = written
+
+    def summary(self):
+        frames = self.frames or 1
+        out = (f"{'full redraw' if self.full else 'damage tracked'}: "
+               f"curses calls/frame: {self.calls / frames:.0f}  cells/frame: {self.cells / frames:.0f}")
+        if self._mark is not None:
+            out += f"  bytes/frame: {self.bytes / frames:.0f}"
+        return out
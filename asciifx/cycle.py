@@ -0,0 +1,67 @@
+"""
+Main loop for the animations that repeat in a fixed cycle (spiral4-6).
+
+Frame n of these is a function of n % period alone, so the loop only has
+to pick the frame index and hand it to a FrameCache (asciifx.framecache):
+
+    frame_cache = cache_for(session, period)
+    sched = play(session, back_buffer, frame_cache, 0.03,
+                 lambda index, width, height: ...back_buffer.render(...))
+
+play() advances in whole frames only, so the cached cycle still applies:
+the frame steps the scheduler reports (late frames included) are scaled
+by the + / - speed and, with --audio, the music's loudness, and the
+fraction left over is carried to the next frame.  It returns the
+FrameScheduler for --stats.
+"""
+
+import sys
+
+from asciifx.keys import speed_key
+from asciifx.scheduler import FrameScheduler
+from asciifx.writer import write_control
+
+
+def play(session, screen, frame_cache, frame_delay, draw):
+    """Show frames of the cycle through screen until the session ends.
+
+    draw(index, width, height) renders frame index and returns the text
+    from screen.render(); it is only called when the cache misses.
+    """
+    prof = screen.profiler = session.profiler
+    sched = FrameScheduler.for_session(session, frame_delay)
+    audio = session.audio  # --audio=SRC: the music sets the pace
+    keys = session.keys
+    speed = 1.0  # + / - keys
+    n, prev, ahead = 0, None, 0.0
+    try:
+        with session:
+            write_control("\033[2J\033[H")
+            sys.stdout.flush()
+            while True:
+                if prof:
+                    prof.frame()
+                if keys:
+                    for key in keys.poll():
+                        speed = speed_key(speed, key)
+                width, height = session.size()
+                index = n % frame_cache.period
+                frame_cache.present(screen, prev, index, (width, height),
+                                    lambda: draw(index, width, height))
+                prev = index
+                if prof:
+                    prof.end_frame(width)
+                if not session.end_frame():
+                    break
+                steps = sched.wait()
+                gain = speed
+                if audio:
+                    audio.update(session.now())
+                    gain *= audio.map("level", 0.5, 3.0)
+                ahead += steps * gain
+                steps = int(ahead)
+                ahead -= steps
+                n += steps
+    except KeyboardInterrupt:
+        sys.stdout.write("\033[0m\n")
+    return sched
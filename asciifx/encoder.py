@@ -0,0 +1,39 @@
+"""
+Frame encoder with SGR run coalescing.
+
+A frame is two parallel grids: glyphs (one character per cell) and colors
+(the SGR escape for that cell, "" for the terminal's default color).  The
+encoder only emits a color escape when the color actually changes between
+neighbouring visible cells and never resets between cells; spaces keep
+whatever color is active since it does not show on them.
+"""
+
+RESET = "\033[0m"
+DEFAULT_FG = "\033[39m"
+
+# ready-made foreground escapes for the xterm 256-color palette
+FG_256 = [f"\033[38;5;{i}m" for i in range(256)]
+
+
+def encode_row(glyphs, colors, current=""):
+    # returns (text, color active after the row)
+    out = []
+    for ch, color in zip(glyphs, colors):
+        if ch != " " and color != current:
+            out.append(color or DEFAULT_FG)
+            current = color
+        out.append(ch)
+    return "".join(out), current
+
+
+def encode_frame(glyph_rows, color_rows):
+    # rows joined by newlines; one reset at the very end if a color is active
+    lines = []
+    current = ""
+    for glyphs, colors in zip(glyph_rows, color_rows):
+        text, current = encode_row(glyphs, colors, current)
+        lines.append(text)
+    text = "\n".join(lines)
+    if current:
+        text += RESET
+    return text
@@ -0,0 +1,108 @@
+"""
+Replay cache for animations that loop.
+
+spiral4-6 draw frame n from n alone (a rotation phase and, for spiral6, an
+expansion offset), so once their per-frame steps are rounded to divide the
+cycle, frame n + period is frame n again.  FrameCache keeps the encoded
+output of each transition (previous frame index, frame index) that
+ScreenBuffer produced, and after the first cycle the loop just writes the
+stored text: no rasterizing, no diffing.
+
+The frames come back in a fixed cycle, so least-recently-used eviction
+would always throw out the frame needed next: a period that does not fit
+would never hit.  Once the budget is full the cache stops taking entries
+instead, and the part of the cycle it holds keeps hitting; --stats
+reports the hit rate and the frames turned away.  A resize clears
+everything.
+
+    --cache-mb=32   budget per cache
+    --no-cache      render every frame
+"""
+
+import math
+
+BUDGET = 32 * 2**20  # bytes of encoded frames kept per cache
+
+
+def loop_frames(speed, cycle, align=1, tolerance=0.02):
+    """Frames per cycle when advancing about speed per frame, as an integer.
+
+    With align, the count may move by up to tolerance (relative) to keep
+    the combined period lcm(count, align) short.
+    """
+    frames = max(1, round(cycle / abs(speed)))
+    if align == 1:
+        return frames
+    spread = int(frames * tolerance)
+    candidates = range(max(1, frames - spread), frames + spread + 1)
+    return min(candidates, key=lambda k: (math.lcm(k, align), abs(k - frames)))
+
+
+class FrameCache:
+    def __init__(self, period, budget=BUDGET):
+        self.period = period
+        self.budget = budget
+        self.size = None
+        self.entries = {}  # (prev index, index) -> encoded text
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.full = 0  # entries turned away over budget
+
+    def reset(self, size):
+        # new terminal size: nothing cached so far can be shown
+        self.size = size
+        self.entries.clear()
+        self.nbytes = 0
+
+    def get(self, prev, index):
+        data = self.entries.get((prev, index))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, prev, index, data):
+        if len(data) > self.budget:  # also: caching disabled
+            return
+        if self.nbytes + len(data) > self.budget:
+            # full: keep the frames already held, they come round again
+            self.full += 1
+            return
+        self.entries[(prev, index)] = data
+        self.nbytes += len(data)
+
+    def present(self, screen, prev, index, size, render):
+        """Show frame index, coming from frame prev, through a ScreenBuffer.
+
+        render() is only called on a miss and must return the text from
+        screen.render(); a hit replays the stored text instead.
+        """
+        if size != self.size:
+            self.reset(size)
+        if screen.output_pending():
+            # the previous frame may be dropped: no transition from it is
+            # safe, so render (a full repaint) and keep the cache as it is
+            screen.write(render())
+            return
+        data = self.get(prev, index)
+        if data is None:
+            data = render()
+            self.put(prev, index, data)
+            screen.write(data)
+        else:
+            screen.replay(data)
+
+    def summary(self):
+        lookups = (self.hits + self.misses) or 1
+        return (f"period: {self.period} frames  cached: {len(self.entries)} "
+                f"({self.nbytes / 2**20:.1f} MB)  hits: {self.hits / lookups:.1%}  "
+                f"not cached (full): {self.full}")
+
+
+def cache_for(session, period):
+    # --cache-mb=N sets the budget; --no-cache makes it zero (always a miss)
+    if "no-cache" in session.flags:
+        return FrameCache(period, 0)
+    return FrameCache(period, int(float(session.options.get("cache-mb", BUDGET / 2**20)) * 2**20))
@@ -0,0 +1,101 @@
+"""
+Frame-time governor: fits an effect's load to a frame-rate target.
+
+The particle effects keep spawning, so their population, and the frame
+time with it, grows until the terminal cannot keep up.  Governor measures
+the busy part of each frame (everything but the scheduler's sleep) and
+moves a load factor, scale, between min_scale and 1; the effects multiply
+their spawn rates, particle caps or star counts by it.
+
+Decisions use hysteresis so the scale does not oscillate:
+
+    mean busy time > target           scale down by DOWN
+    mean busy time < target * HEADROOM scale up by UP
+    in between                        hold
+
+measured over the last WINDOW frames, and after a change the governor
+waits WINDOW frames for its effect to show before deciding again.
+
+    --target-fps=30     frame-rate target for this display (off by default)
+
+With --stats, summary() prints the scale, the busy time and the decisions
+taken; metrics() returns the same as a dict.
+"""
+
+import time
+from collections import deque
+
+WINDOW = 15     # frames averaged per decision, and waited after one
+DOWN = 0.85     # scale factor when over the target
+UP = 1.05       # scale factor when well under it
+HEADROOM = 0.75  # "well under": below this fraction of the target
+
+
+class Governor:
+    def __init__(self, target_fps, min_scale=0.05, window=WINDOW):
+        self.target = 1.0 / target_fps
+        self.min_scale = min_scale
+        self.scale = 1.0
+        self.busy = deque(maxlen=window)
+        self.cooldown = window
+        self.frames = 0
+        self.downs = 0
+        self.ups = 0
+        self.low_scale = 1.0
+        self.decisions = []  # (frame, mean busy seconds, new scale)
+        self._start = None
+
+    def begin(self):
+        self._start = time.perf_counter()
+
+    def end(self):
+        """Record the frame's busy time and adjust scale; return scale."""
+        if self._start is None:
+            return self.scale
+        self.busy.append(time.perf_counter() - self._start)
+        self._start = None
+        self.frames += 1
+        if self.cooldown:
+            self.cooldown -= 1
+            return self.scale
+        mean = sum(self.busy) / len(self.busy)
+        if mean > self.target and self.scale > self.min_scale:
+            self.scale = max(self.min_scale, self.scale * DOWN)
+            self.downs += 1
+        elif mean < self.target * HEADROOM and self.scale < 1.0:
+            self.scale = min(1.0, self.scale * UP)
+            self.ups += 1
+        else:
+            return self.scale
+        self.low_scale = min(self.low_scale, self.scale)
+        self.decisions.append((self.frames, mean, self.scale))
+        self.cooldown = self.busy.maxlen
+        return self.scale
+
+    def cap(self, limit, floor=1):
+        # limit (a particle or star count) scaled to the current load
+        return max(floor, int(limit * self.scale))
+
+    def metrics(self):
+        n = len(self.busy) or 1
+        return {
+            "target_ms": self.target * 1000,
+            "busy_ms": sum(self.busy) / n * 1000,
+            "scale": self.scale,
+            "low_scale": self.low_scale,
+            "downs": self.downs,
+            "ups": self.ups,
+            "frames": self.frames,
+        }
+
+    def summary(self):
+        m = self.metrics()
+        return (f"governor: target {m['target_ms']:.1f} ms  busy {m['busy_ms']:.1f} ms  "
+                f"scale {m['scale']:.2f} (low {m['low_scale']:.2f})  "
+                f"downs: {m['downs']}  ups: {m['ups']}")
+
+
+def governor_for(session):
+    # a Governor for --target-fps=N, None without one
+    fps = session.options.get("target-fps")
+    return Governor(float(fps)) if fps else None
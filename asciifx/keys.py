@@ -0,0 +1,200 @@
+"""
+Keyboard input for the animation loops.
+
+The loop calls keys.poll() once per frame and gets the keys pressed since
+the last call, in order, as a list of names: printable characters as
+themselves, and "up", "down", "left", "right", "space", "enter", "esc".
+"q" and Esc set keys.quit, which ends the session's loop at end_frame().
+Esc counts only when nothing follows it in the same read; Home, PgUp,
+F-keys and Alt+key also start with it and are ignored.
+
+TerminalKeys puts a terminal's stdin into cbreak mode (no echo, no line
+buffering; Ctrl+C still interrupts) and polls it through a selector with
+a zero timeout, so a frame without a key press costs one select() call.
+Everything that arrived is read in one go.  CursesKeys does the same for
+a curses window with nodelay getch().  Headless sessions can replay keys
+from --keys=FRAME:KEY,... (e.g. --keys=10:+,20:+,40:c).
+
+Keys the effects share:
+
+    + / -     faster / slower
+    [ / ]     fewer / more (spiral arms, particle budget)
+    c         next color mode
+    q, Esc    quit
+
+    --no-keys   leave stdin alone
+"""
+
+import os
+import selectors
+import sys
+
+try:
+    import termios
+    import tty
+except ImportError:  # not a POSIX terminal: no keyboard input
+    termios = None
+
+ARROWS = {"A": "up", "B": "down", "C": "right", "D": "left"}  # final byte of CSI / SS3
+NAMES = {" ": "space", "\r": "enter", "\n": "enter", "\033": "esc"}
+QUIT = ("q", "esc")
+
+
+def parse(text):
+    # a batch of terminal input -> key names.  Esc counts only when nothing
+    # follows it in the batch: keys like Home, PgUp, F1 or Alt+x also start
+    # with it, and the sequences other than the arrows are swallowed
+    keys, i, n = [], 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch != "\033":
+            keys.append(NAMES.get(ch, ch))
+            i += 1
+            continue
+        if i + 1 == n or text[i + 1] == "\033":
+            keys.append("esc")
+            i += 1
+            continue
+        kind = text[i + 1]
+        if kind == "[":
+            # CSI: parameter and intermediate bytes, then a final byte
+            j = i + 2
+            while j < n and not "\x40" <= text[j] <= "\x7e":
+                j += 1
+            if j < n and text[j] in ARROWS:
+                keys.append(ARROWS[text[j]])
+            i = j + 1
+        elif kind == "O":
+            # SS3: one final byte (arrows in application mode, F1-F4)
+            if i + 2 < n and text[i + 2] in ARROWS:
+                keys.append(ARROWS[text[i + 2]])
+            i += 3
+        else:
+            i += 2  # Alt+key
+    return keys
+
+
+class TerminalKeys:
+    quit = False
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.saved = None
+        self.selector = None
+
+    def open(self):
+        self.saved = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.fd, selectors.EVENT_READ)
+
+    def poll(self):
+        chunks = []
+        while self.selector.select(0):
+            data = os.read(self.fd, 1024)
+            if not data:  # stdin closed
+                break
+            chunks.append(data)
+        if not chunks:
+            return []
+        keys = parse(b"".join(chunks).decode(errors="replace"))
+        self.quit = self.quit or any(k in QUIT for k in keys)
+        return keys
+
+    def close(self):
+        if self.selector:
+            self.selector.close()
+            self.selector = None
+        if self.saved is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+            self.saved = None
+
+
+class CursesKeys:
+    quit = False
+
+    def __init__(self, stdscr):
+        import curses
+        self.stdscr = stdscr
+        self.names = {curses.KEY_UP: "up", curses.KEY_DOWN: "down",
+                      curses.KEY_LEFT: "left", curses.KEY_RIGHT: "right"}
+        stdscr.nodelay(True)
+        stdscr.keypad(True)
+
+    def poll(self):
+        codes = []
+        while True:
+            code = self.stdscr.getch()
+            if code == -1:
+                break
+            codes.append(code)
+        # runs of plain bytes go through parse(), so an Esc sequence curses
+        # did not decode is swallowed whole, as from a terminal
+        keys, run = [], []
+        for code in codes:
+            if 0 <= code < 256:
+                run.append(chr(code))
+                continue
+            if run:
+                keys += parse("".join(run))
+                run = []
+            if code in self.names:
+                keys.append(self.names[code])
+        if run:
+            keys += parse("".join(run))
+        self.quit = self.quit or any(k in QUIT for k in keys)
+        return keys
+
+
+class ScriptedKeys:
+    # --keys=FRAME:KEY,... for headless runs; FRAME counts poll() calls
+    quit = False
+
+    def __init__(self, spec):
+        self.script = {}
+        for item in spec.split(","):
+            frame, key = item.split(":", 1)
+            self.script.setdefault(int(frame), []).append(NAMES.get(key, key))
+        self.frame = 0
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def poll(self):
+        keys = self.script.get(self.frame, [])
+        self.frame += 1
+        self.quit = self.quit or any(k in QUIT for k in keys)
+        return keys
+
+
+def keys_from_options(argv, opts, headless):
+    if "keys" in opts:
+        return ScriptedKeys(opts["keys"])
+    if headless or termios is None or "--no-keys" in argv or opts.get("audio") == "-":
+        return None
+    if not sys.stdin.isatty():
+        return None
+    return TerminalKeys(sys.stdin.fileno())
+
+
+# shared key bindings
+def speed_key(speed, key, low=0.125, high=8.0):
+    # + / - scale a speed factor
+    if key in ("+", "="):
+        return min(high, speed * 1.25)
+    if key in ("-", "_"):
+        return max(low, speed / 1.25)
+    return speed
+
+
+def count_key(value, key, low, high, step=1):
+    # [ / ] step a count; a float step multiplies instead
+    if key not in ("[", "]"):
+        return value
+    if isinstance(step, float):
+        value = value * step if key == "]" else value / step
+        return max(low, min(high, int(value)))
+    return max(low, min(high, value + (step if key == "]" else -step)))
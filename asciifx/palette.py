@@ -0,0 +1,178 @@
+"""
+Quantized HSV -> escape sequence lookup tables.
+
+Instead of converting HSV to RGB and formatting an escape for every visible
+cell, the renderers quantize (hue, saturation, value) and index a table of
+ready-made escape strings.  Tables exist for truecolor and 256-color output;
+their resolution is configurable, nbytes reports the memory they hold and
+max_error() measures the worst channel error against the exact conversion.
+
+At the default 256x16x16 resolution that error is allowed to be at most
+MAX_ERROR (per channel, out of 255; tests/test_palette.py checks it):
+15 in truecolor, where half a saturation/value step dominates, and 51 in
+256-color mode, one step of the color cube, which exact rounding also
+makes at a bin edge.
+
+Entries are filled in on first use, so a renderer only pays for the colors
+it actually shows (a full table costs ~170 ms to build, which used to
+dominate time to first frame).
+"""
+
+import sys
+from array import array
+from functools import lru_cache
+
+from asciifx.encoder import FG_256
+
+HUE_STEPS = 256
+SAT_STEPS = 16
+VAL_STEPS = 16
+MAX_ERROR = {"truecolor": 15, "256": 51}  # allowed max_error() at the default resolution
+
+
+# convert hsv (0..1) to RGB (0..255)
+def hsv_to_rgb(h, s, v):
+    if s == 0.0:
+        r = g = b = int(v * 255)
+        return r, g, b
+    i = int(h * 6.0)  # assume h in [0,1)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+    if i == 0:
+        r, g, b = v, t, p
+    elif i == 1:
+        r, g, b = q, v, p
+    elif i == 2:
+        r, g, b = p, v, t
+    elif i == 3:
+        r, g, b = p, q, v
+    elif i == 4:
+        r, g, b = t, p, v
+    else:
+        r, g, b = v, p, q
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
+def rgb_to_cube(r, g, b):
+    # map 0..255 to the xterm 256 color cube 16..231
+    r6 = int((r/255.0)*5 + 0.5)
+    g6 = int((g/255.0)*5 + 0.5)
+    b6 = int((b/255.0)*5 + 0.5)
+    return 16 + 36*r6 + 6*g6 + b6
+
+
+def cube_to_rgb(code):
+    code -= 16
+    return (code // 36) * 51, (code // 6 % 6) * 51, (code % 6) * 51
+
+
+class ColorTable:
+    """Escape strings indexed by quantized (hue, sat, val).
+
+    Hue wraps and is split into hue_steps equal bins; saturation and value
+    are rounded to sat_steps / val_steps evenly spaced levels over 0..1.
+    """
+
+    def __init__(self, mode="truecolor", hue_steps=HUE_STEPS, sat_steps=SAT_STEPS, val_steps=VAL_STEPS):
+        if mode not in ("truecolor", "256"):
+            raise ValueError(f"unknown color mode: {mode!r}")
+        if hue_steps < 1 or sat_steps < 2 or val_steps < 2:
+            raise ValueError("need at least 1 hue step and 2 sat/val steps")
+        self.mode = mode
+        self.hue_steps = hue_steps
+        self.sat_steps = sat_steps
+        self.val_steps = val_steps
+
+        size = hue_steps * sat_steps * val_steps
+        self.table = [None] * size  # None until filled
+        self.rgb = array("B", bytes(3 * size))  # r, g, b per entry, for max_error()
+        self._seqs = {}
+
+    def _fill(self, i):
+        hi, rest = divmod(i, self.sat_steps * self.val_steps)
+        si, vi = divmod(rest, self.val_steps)
+        rgb = hsv_to_rgb((hi + 0.5) / self.hue_steps, si / (self.sat_steps - 1),
+                         vi / (self.val_steps - 1))
+        if self.mode == "truecolor":
+            seq = self._seqs.get(rgb)
+            if seq is None:
+                seq = self._seqs[rgb] = "\033[38;2;{};{};{}m".format(*rgb)
+        else:
+            code = rgb_to_cube(*rgb)
+            rgb = cube_to_rgb(code)
+            seq = FG_256[code]
+        self.rgb[3 * i:3 * i + 3] = array("B", rgb)
+        self.table[i] = seq
+        return seq
+
+    def entry(self, i):
+        return self.table[i] or self._fill(i)
+
+    def fill(self):
+        # build every entry now, e.g. before measuring the whole table
+        for i, seq in enumerate(self.table):
+            if seq is None:
+                self._fill(i)
+
+    def index(self, h, s, v):
+        # h is taken modulo 1, s and v must be within 0..1
+        return ((int(h * self.hue_steps) % self.hue_steps) * self.sat_steps
+                + int(s * (self.sat_steps - 1) + 0.5)) * self.val_steps \
+            + int(v * (self.val_steps - 1) + 0.5)
+
+    def lookup(self, h, s, v):
+        i = self.index(h, s, v)
+        return self.table[i] or self._fill(i)
+
+    def index_array(self, h, s, v):
+        # numpy version of index(); h, s, v are float arrays
+        hi = (h * self.hue_steps).astype("int64") % self.hue_steps
+        si = (s * (self.sat_steps - 1) + 0.5).astype("int64")
+        vi = (v * (self.val_steps - 1) + 0.5).astype("int64")
+        return (hi * self.sat_steps + si) * self.val_steps + vi
+
+    @property
+    def nbytes(self):
+        # the table, its distinct escape strings and the rgb array, as filled so far
+        total = sys.getsizeof(self.table) + sys.getsizeof(self.rgb)
+        seen = set()
+        for seq in self.table:
+            if seq is not None and id(seq) not in seen:
+                seen.add(id(seq))
+                total += sys.getsizeof(seq)
+        return total
+
+    def exact_rgb(self, h, s, v):
+        # the color the unquantized path would emit, as 0..255 RGB
+        rgb = hsv_to_rgb(h % 1.0, s, v)
+        if self.mode == "256":
+            rgb = cube_to_rgb(rgb_to_cube(*rgb))
+        return rgb
+
+    def max_error(self, samples=41):
+        # worst per-channel difference (0..255) over a samples^3 HSV grid,
+        # offset so the grid does not line up with the table bins
+        self.fill()
+        worst = 0
+        n = samples
+        for a in range(n):
+            h = (a + 0.37) / n
+            for b in range(n):
+                s = b / (n - 1)
+                for c in range(n):
+                    v = c / (n - 1)
+                    exact = self.exact_rgb(h, s, v)
+                    i = 3 * self.index(h, s, v)
+                    got = self.rgb[i:i + 3]
+                    worst = max(worst, abs(exact[0] - got[0]), abs(exact[1] - got[1]),
+                                abs(exact[2] - got[2]))
+        return worst
+
+
+@lru_cache(maxsize=None)
+def color_table(mode="truecolor", hue_steps=HUE_STEPS, sat_steps=SAT_STEPS, val_steps=VAL_STEPS):
+    # tables are shared per (mode, resolution) and built on first use
+    return ColorTable(mode, hue_steps, sat_steps, val_steps)
@@ -0,0 +1,171 @@
+"""
+Struct-of-arrays particle engine for the supernova scripts.
+
+Particles live in parallel numpy columns (position, velocity, color index,
+symbol index, lifetime, kind flags) and are updated, culled, spawned and
+rasterized in bulk.  The per-script behaviors map onto a few switches:
+
+    jitter="position"   supernova.py   turbulence nudges the position
+    jitter="velocity"   supernova2/3   turbulence accumulates in velocity
+    GLOBULE flag        supernova3     dark patches that erase their area
+    SPIRAL flag         supernova3     particles steered around their center
+"""
+
+import math
+import random
+
+import numpy as np
+
+GLOBULE = 1
+SPIRAL = 2
+
+FIELDS = ("x", "y", "vx", "vy", "cx", "cy", "color", "symbol", "life", "flags")
+DTYPES = {"color": np.int16, "symbol": np.int16, "life": np.int32, "flags": np.uint8}
+
+
+class ParticleField:
+    def __init__(self, capacity=4096, jitter="velocity", turbulence=0.05,
+                 spiral_strength=1.0, radial_correction=0.02, seed=None, max_particles=None):
+        if jitter not in ("position", "velocity"):
+            raise ValueError(f"unknown jitter mode: {jitter!r}")
+        self.jitter = jitter
+        self.turbulence = turbulence
+        self.spiral_strength = spiral_strength
+        self.radial_correction = radial_correction
+        # unseeded fields draw their seed from the random module, so that
+        # random.seed() alone makes a whole run reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+        self.max_particles = max_particles  # hard cap, None for unbounded
+        self.n = 0
+        self.spawned = 0
+        self.rejected = 0
+        for name in FIELDS:
+            setattr(self, name, np.zeros(capacity, DTYPES.get(name, np.float64)))
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _reserve(self, extra):
+        need = self.n + extra
+        if need <= self.capacity:
+            return
+        size = max(need, 2 * self.capacity)
+        for name in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(size, old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, vx, vy, color, symbol, life, flags=0):
+        # every argument is a scalar or an array of the burst size; particles
+        # beyond max_particles are dropped from the end of the burst
+        count = len(vx)
+        if self.max_particles is not None and self.n + count > self.max_particles:
+            take = max(0, self.max_particles - self.n)
+            self.rejected += count - take
+            x, y, vx, vy, color, symbol, life, flags = (
+                a[:take] if isinstance(a, np.ndarray) else a
+                for a in (x, y, vx, vy, color, symbol, life, flags))
+            count = take
+        self._reserve(count)
+        s = slice(self.n, self.n + count)
+        self.x[s] = x
+        self.y[s] = y
+        self.cx[s] = x
+        self.cy[s] = y
+        self.vx[s] = vx
+        self.vy[s] = vy
+        self.color[s] = color
+        self.symbol[s] = symbol
+        self.life[s] = life
+        self.flags[s] = flags
+        self.n += count
+        self.spawned += count
+
+    def burst(self, cx, cy, speed, color, symbol, life, flags=0):
+        # spawn at (cx, cy) moving outward in uniformly random directions
+        angle = self.rng.uniform(0, 2*math.pi, len(speed))
+        self.spawn(cx, cy, speed * np.cos(angle), speed * np.sin(angle), color, symbol, life, flags)
+
+    def update(self):
+        n = self.n
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        turb = self.turbulence
+        if self.jitter == "position":
+            x += vx + self.rng.uniform(-turb, turb, n)
+            y += vy + self.rng.uniform(-turb, turb, n)
+        else:
+            vx += self.rng.uniform(-turb, turb, n)
+            vy += self.rng.uniform(-turb, turb, n)
+            spiral = np.flatnonzero(self.flags[:n] & SPIRAL)
+            if len(spiral):
+                self._steer(spiral)
+            x += vx
+            y += vy
+        self.life[:n] -= 1
+
+    def _steer(self, idx):
+        # push spiral particles along their orbit, slightly toward the center
+        dx = self.x[idx] - self.cx[idx]
+        dy = self.y[idx] - self.cy[idx]
+        r = np.hypot(dx, dy) + 0.0001
+        angle = np.arctan2(dy, dx) + self.spiral_strength
+        vx = self.vx[idx] - dx * self.radial_correction / r
+        vy = self.vy[idx] - dy * self.radial_correction / r
+        speed = np.hypot(vx, vy)
+        speed[speed == 0] = 0.3
+        self.vx[idx] = speed * np.cos(angle)
+        self.vy[idx] = speed * np.sin(angle)
+
+    def cull(self):
+        # drop dead particles, keeping the survivors packed at the front
+        n = self.n
+        keep = np.flatnonzero(self.life[:n] > 0)
+        if len(keep) == n:
+            return
+        for name in FIELDS:
+            col = getattr(self, name)
+            col[:len(keep)] = col[keep]
+        self.n = len(keep)
+
+    def positions(self, behind=0.0, idx=None):
+        # cell coordinates, behind steps back along the velocity (interpolation)
+        if idx is None:
+            idx = slice(0, self.n)
+        x, y = self.x[idx], self.y[idx]
+        if behind:
+            x = x - self.vx[idx] * behind
+            y = y - self.vy[idx] * behind
+        return x.astype(np.int64), y.astype(np.int64)
+
+    def raster(self, width, height, symbol=None, behind=0.0):
+        """Return (symbol grid, color grid) index arrays, -1 where empty.
+
+        symbol overrides the stored symbol indices (e.g. one drawn per frame).
+        Later particles overwrite earlier ones in the same cell.
+        """
+        n = self.n
+        sym_grid = np.full((height, width), -1, np.int16)
+        col_grid = np.full((height, width), -1, np.int16)
+        xi, yi = self.positions(behind)
+        inside = np.flatnonzero((xi >= 0) & (xi < width) & (yi >= 0) & (yi < height))
+        if symbol is None:
+            symbol = self.symbol[:n]
+        sym_grid[yi[inside], xi[inside]] = symbol[inside]
+        col_grid[yi[inside], xi[inside]] = self.color[:n][inside]
+        return sym_grid, col_grid
+
+    def globules(self, behind=0.0):
+        # integer cell positions of live globule particles
+        return self.positions(behind, np.flatnonzero(self.flags[:self.n] & GLOBULE))
+
+
+def grids_to_rows(sym_grid, col_grid, symbols, colors):
+    # index grids -> glyph / color rows for asciifx.encoder; -1 is blank
+    glyph_lut = np.array(list(symbols) + [" "], dtype=object)
+    color_lut = np.array(list(colors) + [""], dtype=object)
+    return glyph_lut[sym_grid].tolist(), color_lut[col_grid].tolist()
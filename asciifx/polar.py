@@ -0,0 +1,53 @@
+"""
+Per-geometry polar coordinate grids.
+
+Every cell's radius and angle from the screen center only change when the
+terminal is resized, so they are built once per (width, height, aspect,
+center) and kept in a small LRU cache.  Resizing back to a recent size is a
+cache hit; polar_grid.cache_info() reports hits and misses.
+"""
+
+import math
+from functools import lru_cache
+
+CACHE_SIZE = 4  # geometries kept; a window drag back and forth stays cached
+
+
+class PolarGrid:
+    """radius / angle / rnorm as lists of rows, indexed [y][x]."""
+
+    def __init__(self, width, height, aspect=1.0, center=None):
+        if center is None:
+            center = ((width - 1) / 2.0, (height - 1) / 2.0)
+        cx, cy = center
+        self.width = width
+        self.height = height
+        self.cx = cx
+        self.cy = cy
+        self.max_r = math.hypot(cx, cy) or 1.0
+
+        self.radius = []
+        self.angle = []
+        self.rnorm = []
+        for y in range(height):
+            ry = (y - cy) * aspect
+            rad = [math.hypot(x - cx, ry) for x in range(width)]
+            self.radius.append(rad)
+            self.angle.append([math.atan2(ry, x - cx) for x in range(width)])
+            self.rnorm.append([r / self.max_r for r in rad])
+        self._arrays = None
+
+    def arrays(self):
+        # (radius, angle, rnorm) as float arrays, built on first use.  numpy
+        # is imported here, not at module level, so that the effects that
+        # only use the row lists start without it.
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = (np.array(self.radius), np.array(self.angle), np.array(self.rnorm))
+        return self._arrays
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def polar_grid(width, height, aspect=1.0, center=None):
+    # center defaults to the geometric center ((w-1)/2, (h-1)/2)
+    return PolarGrid(width, height, aspect, center)
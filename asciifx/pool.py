@@ -0,0 +1,59 @@
+"""
+Fixed-capacity object pool with free-list recycling.
+
+All slots are allocated up front by calling factory(); spawning pops a slot
+off the free list and re-initializes it with slot.reset(*args), and dead
+particles go back on the free list instead of being garbage.  The live list
+is compacted in place, so a long session allocates nothing per frame.
+When the pool is full, spawns are rejected (and counted) rather than grown.
+"""
+
+
+class ParticlePool:
+    def __init__(self, factory, capacity):
+        self.capacity = capacity
+        self.live = []
+        self.free = [factory() for _ in range(capacity)]
+        self.fresh = capacity  # never-used slots sit at the bottom of free
+        self.spawns = 0
+        self.recycles = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def spawn(self, *args):
+        # returns the initialized slot, or None when the pool is full
+        free = self.free
+        if not free:
+            self.rejections += 1
+            return None
+        if len(free) > self.fresh:
+            self.recycles += 1
+        else:
+            self.fresh -= 1
+        p = free.pop()
+        p.reset(*args)
+        self.live.append(p)
+        self.spawns += 1
+        return p
+
+    def retain(self, keep):
+        # keep live slots for which keep(p) is true, free the rest
+        live = self.live
+        free = self.free
+        w = 0
+        for p in live:
+            if keep(p):
+                live[w] = p
+                w += 1
+            else:
+                free.append(p)
+        del live[w:]
+
+    def summary(self):
+        return (f"live: {len(self.live)}/{self.capacity}  spawns: {self.spawns}  "
+                f"recycles: {self.recycles}  rejections: {self.rejections}")
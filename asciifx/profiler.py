@@ -0,0 +1,102 @@
+"""
+Per-phase frame timing.
+
+A frame is split into four phases, timed back to back:
+
+    sim      particle updates, spawning, phase/offset bookkeeping
+    raster   filling the glyph / color grids
+    encode   building the escape-sequence text
+    write    sys.stdout.write and flush (or curses refresh)
+
+The loop calls frame() when a frame starts, lap(phase) when a phase ends
+(the time since the previous lap is charged to it) and end_frame() when
+the frame is done.  ScreenBuffer laps raster/encode/write by itself when
+given a profiler.
+
+    --hud               one-line overlay: rolling FPS and ms per phase
+    --profile=out.csv   one CSV row per frame
+
+Without either flag the session's profiler is None and the loops skip
+every call behind an `if prof:` test.
+"""
+
+import csv
+import sys
+import time
+from collections import deque
+
+PHASES = ("sim", "raster", "encode", "write")
+_INDEX = {name: i for i, name in enumerate(PHASES)}
+
+
+class FrameProfiler:
+    def __init__(self, hud=False, csv_path=None, window=30):
+        self.hud = hud
+        self.frames = 0
+        self.current = [0.0] * len(PHASES)
+        self.history = deque(maxlen=window)  # per-phase seconds of recent frames
+        self.stamps = deque(maxlen=window + 1)  # end_frame times, for FPS
+        self.totals = [0.0] * len(PHASES)
+        self._mark = None
+        self._file = None
+        self._csv = None
+        if csv_path:
+            self._file = open(csv_path, "w", newline="")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(["frame"] + [f"{p}_ms" for p in PHASES] + ["total_ms"])
+
+    def frame(self):
+        self.current = [0.0] * len(PHASES)
+        self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        if self._mark is not None:
+            self.current[_INDEX[phase]] += now - self._mark
+        self._mark = now
+
+    def end_frame(self, width=None):
+        # record the frame; with the HUD on and a width given, draw it on
+        # the top row of the terminal
+        current = self.current
+        self.history.append(current)
+        self.stamps.append(time.perf_counter())
+        for i, seconds in enumerate(current):
+            self.totals[i] += seconds
+        self.frames += 1
+        self._mark = None
+        if self._csv:
+            self._csv.writerow([self.frames] + [f"{s * 1000:.3f}" for s in current] +
+                               [f"{sum(current) * 1000:.3f}"])
+        if self.hud and width:
+            sys.stdout.write(f"\033[H\033[0;7m{self.hud_line(width)}\033[0m")
+            sys.stdout.flush()
+
+    def fps(self):
+        if len(self.stamps) < 2:
+            return 0.0
+        span = self.stamps[-1] - self.stamps[0]
+        return (len(self.stamps) - 1) / span if span > 0 else 0.0
+
+    def hud_line(self, width):
+        n = len(self.history) or 1
+        parts = [f"{self.fps():5.1f} fps"]
+        for i, name in enumerate(PHASES):
+            parts.append(f"{name} {sum(f[i] for f in self.history) / n * 1000:6.2f}")
+        return (" | ".join(parts) + " ms")[:width]
+
+    def summary(self):
+        n = self.frames or 1
+        return "  ".join(f"{name}: {self.totals[i] / n * 1000:.2f} ms"
+                         for i, name in enumerate(PHASES))
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = self._csv = None
+
+
+def profiler_from_options(argv, opts):
+    if "--hud" not in argv and "profile" not in opts:
+        return None
+    return FrameProfiler(hud="--hud" in argv, csv_path=opts.get("profile"))
@@ -0,0 +1,52 @@
+"""
+The effects, by name, and how to load them.
+
+Nothing here imports an effect until it is asked for: inferno and tiedye
+load the vortex art (asciifx/art.py) at import time, the numpy paths pull
+in numpy and supernova4 pulls in curses, so the launcher only pays for
+the one that was selected.  Every entry point takes session= (see
+asciifx.session).
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (module under the repo root, entry point, description)
+EFFECTS = {
+    "golden": ("golden", "main", "golden-ratio spiral"),
+    "milky": ("milky", "main", "rotating Milky Way"),
+    "inferno": ("inferno", "main", "swirling ASCII galaxy, outward"),
+    "tiedye": ("tiedye", "run_animation", "triple-arm tie-dye galaxy"),
+    "spiral4": ("spiral.spiral4", "main", "Archimedean spiral"),
+    "spiral5": ("spiral.spiral5", "main", "full-circle golden spiral"),
+    "spiral6": ("spiral.spiral6", "main", "spiral with outward motion"),
+    "supernova": ("supernova.supernova", "supernova_simulation", "particle explosion"),
+    "supernova2": ("supernova.supernova2", "supernova_simulation", "dense chaotic explosion"),
+    "supernova3": ("supernova.supernova3", "supernova_simulation", "explosion with globules and a spiral"),
+    "supernova4": ("supernova.supernova4", "main", "galaxy formation (curses)"),
+}
+
+
+def path_of(name):
+    return os.path.join(ROOT, *EFFECTS[name][0].split(".")) + ".py"
+
+
+def load(name):
+    # import the effect's module (once) and return its entry point
+    module, entry, _ = EFFECTS[name]
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    return getattr(importlib.import_module(module), entry)
+
+
+def load_fresh(name):
+    # a private copy of the module: no caches or buffers shared with earlier runs
+    module, entry, _ = EFFECTS[name]
+    spec = importlib.util.spec_from_file_location(f"asciifx_fresh_{name}", path_of(name))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return getattr(mod, entry)
@@ -0,0 +1,94 @@
+"""
+Batched, seedable random numbers for the simulations.
+
+The object-based particle loops called random.uniform() or random.choice()
+once per particle (or per cell) per frame, and those calls were a large part
+of the frame.  BatchRandom draws a frame's worth in one call instead:
+
+    jx = rng.uniform(-0.05, 0.05, len(particles))   # list of n floats
+    picks = rng.choice(symbols, len(particles))      # list of n elements
+    for i in rng.sparse(width * height, 0.02): ...   # indices hit at p=0.02
+
+With numpy the values come from a numpy Generator (PCG64) and are returned
+as Python lists, which the per-object loops consume fastest.  Without numpy
+a random.Random produces them; sparse() then skips from hit to hit by
+geometric gaps instead of testing every index.
+
+A BatchRandom seeds itself from the random module on its first draw, so
+seeding that module alone makes a run reproducible; that is what --seed
+does (session_from_argv) and what asciifx.bench does before every run.
+
+    --seed=1234   seed every generator of the run
+"""
+
+import math
+import random
+
+
+class BatchRandom:
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.started = False
+        self._np = None
+        self._py = None
+
+    def _start(self):
+        # seeded on first use: after --seed / bench have seeded the random module
+        seed = random.getrandbits(64) if self.seed is None else self.seed
+        self.started = True
+        try:
+            import numpy as np  # here, not at import: it costs ~100 ms of start-up
+        except ImportError:  # optional: random.Random instead
+            self._py = random.Random(seed)
+            return
+        self._np = np.random.default_rng(seed)
+
+    def random(self, n):
+        # n floats in [0, 1)
+        if not self.started:
+            self._start()
+        if self._np is not None:
+            return self._np.random(n).tolist()
+        r = self._py.random
+        return [r() for _ in range(n)]
+
+    def uniform(self, low, high, n):
+        # n floats in [low, high)
+        if not self.started:
+            self._start()
+        if self._np is not None:
+            return self._np.uniform(low, high, n).tolist()
+        r, span = self._py.random, high - low
+        return [low + span * r() for _ in range(n)]
+
+    def integers(self, low, high, n):
+        # n ints in [low, high)
+        if not self.started:
+            self._start()
+        if self._np is not None:
+            return self._np.integers(low, high, n).tolist()
+        r, span = self._py.random, high - low
+        return [low + int(span * r()) for _ in range(n)]
+
+    def choice(self, seq, n):
+        # n elements of seq, with replacement
+        return [seq[i] for i in self.integers(0, len(seq), n)]
+
+    def sparse(self, n, p):
+        # the indices in range(n) that a p-probability test per index would hit
+        if not self.started:
+            self._start()
+        if self._np is not None:
+            return (self._np.random(n) < p).nonzero()[0].tolist()
+        if p <= 0:
+            return []
+        if p >= 1:
+            return list(range(n))
+        r, scale = self._py.random, 1.0 / math.log(1.0 - p)
+        hits, i = [], -1
+        while True:
+            # misses before the next hit are geometric
+            i += 1 + int(math.log(1.0 - r()) * scale)
+            if i >= n:
+                return hits
+            hits.append(i)
@@ -0,0 +1,81 @@
+"""
+Deadline-based frame pacing.
+
+Sleeping a constant after every frame makes the frame period the sleep
+plus the render time, so the animation slows down as the terminal grows.
+FrameScheduler instead keeps an absolute deadline per frame on the
+session's monotonic clock and sleeps only for what is left of it.
+
+When a frame finishes after its deadline, the policy decides:
+
+    skip     drop the slots that were missed and wait for the next one
+             (default); wait() reports how many frame steps passed so
+             the animation can keep its on-screen speed
+    catchup  render the late frames back to back until caught up, giving
+             up (resyncing) when more than max_burst frames behind
+    slip     take the late frame as the new time base
+
+Select with --late=skip|catchup|slip.
+"""
+
+POLICIES = ("skip", "catchup", "slip")
+
+
+class FrameScheduler:
+    def __init__(self, session, interval, policy="skip", max_burst=5):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown late-frame policy: {policy!r}")
+        self.now = session.now
+        self.sleep = session.sleep
+        self.interval = interval
+        self.policy = policy
+        self.max_burst = max_burst
+        self.deadline = None
+        self.frames = 0
+        self.missed = 0     # frames that finished after their deadline
+        self.dropped = 0    # frame slots skipped under the skip policy
+        self.jitter_total = 0.0
+        self.jitter_samples = 0  # frames that slept to their deadline
+        self.jitter_max = 0.0
+        self.late_max = 0.0
+
+    @classmethod
+    def for_session(cls, session, interval):
+        return cls(session, interval, session.options.get("late", "skip"))
+
+    def wait(self):
+        """Sleep until the next frame is due; return the frame steps that elapsed."""
+        now = self.now()
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += self.interval
+        self.frames += 1
+        steps = 1
+        late = now - self.deadline
+        if late > 0:
+            self.missed += 1
+            self.late_max = max(self.late_max, late)
+            if self.policy == "skip":
+                behind = int(late // self.interval) + 1
+                self.deadline += behind * self.interval
+                self.dropped += behind
+                steps += behind
+            elif self.policy == "slip" or late > self.max_burst * self.interval:
+                self.deadline = now
+                return steps
+            else:
+                return steps  # catchup: next frame immediately
+        self.sleep(self.deadline - now)
+        jitter = abs(self.now() - self.deadline)
+        self.jitter_total += jitter
+        self.jitter_samples += 1
+        self.jitter_max = max(self.jitter_max, jitter)
+        return steps
+
+    def summary(self):
+        frames = self.frames or 1
+        samples = self.jitter_samples or 1
+        return (f"frames: {self.frames}  missed: {self.missed} ({self.missed / frames:.1%})  "
+                f"dropped: {self.dropped}  late max: {self.late_max * 1000:.1f} ms  "
+                f"jitter: mean {self.jitter_total / samples * 1000:.2f} ms, "
+                f"max {self.jitter_max * 1000:.2f} ms")
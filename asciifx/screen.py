@@ -0,0 +1,143 @@
+"""
+Damage-tracking screen back-buffer.
+
+A frame is a glyph grid plus a parallel color grid (see asciifx.encoder).
+ScreenBuffer remembers the last frame it sent and, for the next one, writes
+only the runs of cells that changed, each prefixed by a cursor-positioning
+escape.  When that diff would be larger than just repainting the whole
+frame, it repaints instead.
+"""
+
+import sys
+
+from asciifx.encoder import DEFAULT_FG, RESET, encode_frame
+
+HOME = "\033[H"
+CLEAR = "\033[2J"
+
+
+def move_to(x, y):
+    # 0-based cell -> 1-based CUP escape
+    return f"\033[{y + 1};{x + 1}H"
+
+
+def same_cell(g0, c0, g1, c1):
+    # a space looks the same whatever color it was given
+    return g0 == g1 and (c0 == c1 or g0 == " ")
+
+
+class ScreenBuffer:
+    def __init__(self, stream=None):
+        self.stream = stream  # None: whatever sys.stdout is at present()
+        self.prev = None
+        self.frames = 0
+        self.bytes_total = 0
+        self.last_bytes = 0
+        self.full_repaints = 0
+        self.profiler = None  # asciifx.profiler.FrameProfiler, laps raster/encode/write
+
+    def invalidate(self):
+        # forget what is on screen; the next frame is a full repaint
+        self.prev = None
+
+    def full_frame(self, glyphs, colors):
+        return HOME + encode_frame(glyphs, colors)
+
+    def diff_frame(self, glyphs, colors):
+        old_glyphs, old_colors = self.prev
+        out = []
+        current = ""
+        for y, row in enumerate(glyphs):
+            crow = colors[y]
+            orow, ocrow = old_glyphs[y], old_colors[y]
+            if row == orow and crow == ocrow:
+                continue
+            x, width = 0, len(row)
+            while x < width:
+                if same_cell(row[x], crow[x], orow[x], ocrow[x]):
+                    x += 1
+                    continue
+                start = x
+                end = x + 1
+                # extend the run; bridge short unchanged gaps when rewriting
+                # them is cheaper than another cursor move
+                while end < width:
+                    if not same_cell(row[end], crow[end], orow[end], ocrow[end]):
+                        end += 1
+                        continue
+                    gap = end
+                    gap_len = 0
+                    while gap < width and same_cell(row[gap], crow[gap], orow[gap], ocrow[gap]):
+                        gap_len += 1 if row[gap] == " " else 1 + len(crow[gap])
+                        gap += 1
+                    if gap < width and gap_len <= len(move_to(gap, y)):
+                        end = gap
+                    else:
+                        break
+                out.append(move_to(start, y))
+                for x in range(start, end):
+                    ch, color = row[x], crow[x]
+                    if ch != " " and color != current:
+                        out.append(color or DEFAULT_FG)
+                        current = color
+                    out.append(ch)
+                x = end
+        if current:
+            out.append(RESET)
+        return "".join(out)
+
+    def output_pending(self):
+        # True while an earlier frame may still be dropped by a background
+        # writer (asciifx.writer); a diff against it would then be wrong
+        stream = self.stream if self.stream is not None else sys.stdout
+        pending = getattr(stream, "output_pending", None)
+        return pending is not None and pending()
+
+    def render(self, glyphs, colors):
+        # encode the frame against the previous one and remember it
+        if self.profiler:
+            self.profiler.lap("raster")
+        full = self.full_frame(glyphs, colors)
+        prev = self.prev
+        if prev is None or len(prev[0]) != len(glyphs) or \
+                (glyphs and len(prev[0][0]) != len(glyphs[0])):
+            data = CLEAR + full
+            self.full_repaints += 1
+        elif self.output_pending():
+            data = full
+            self.full_repaints += 1
+        else:
+            data = self.diff_frame(glyphs, colors)
+            if len(data) >= len(full):
+                data = full
+                self.full_repaints += 1
+        self.prev = ([list(row) for row in glyphs], [list(row) for row in colors])
+        if self.profiler:
+            self.profiler.lap("encode")
+        return data
+
+    def write(self, data):
+        # send rendered text and count it
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(data)
+        stream.flush()
+        if self.profiler:
+            self.profiler.lap("write")
+        self.frames += 1
+        self.last_bytes = len(data)
+        self.bytes_total += self.last_bytes
+        return self.last_bytes
+
+    def present(self, glyphs, colors):
+        return self.write(self.render(glyphs, colors))
+
+    def replay(self, data):
+        # write text rendered earlier (e.g. from a frame cache); the screen
+        # no longer matches prev, so the next rendered frame repaints fully
+        self.prev = None
+        return self.write(data)
+
+    def summary(self):
+        avg = self.bytes_total / self.frames if self.frames else 0
+        return (f"frames: {self.frames}  bytes/frame: {avg:.0f}  "
+                f"last: {self.last_bytes}  full repaints: {self.full_repaints}")
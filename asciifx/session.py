@@ -0,0 +1,302 @@
+"""
+Run-time context for the animation loops: terminal size, clock and output.
+
+LiveSession is the interactive terminal.  HeadlessSession swaps in a fixed
+virtual terminal size, a virtual clock that sleep() advances instead of
+sleeping, and an output sink (an asciicast v2 recording, or nothing), and
+ends the loop after a set number of frames.  Frames are then rendered as
+fast as the code allows and the achieved FPS and bytes per frame are
+printed at the end.
+
+Every entry point accepts:
+
+    --headless=120x50   run headless on a 120x50 virtual terminal
+    --frames=300        frames to render (headless only)
+    --cast=out.cast     record asciicast v2 instead of discarding output
+
+Live sessions write frames on a background thread (asciifx.writer):
+
+    --writer-depth=2    frames that may wait for the terminal (default 1)
+    --no-writer         write on the render thread
+
+and the profiler flags of asciifx.profiler (--hud, --profile=out.csv).
+With --audio=SRC (see asciifx.audio) session.audio holds the audio input;
+session.keys is the keyboard (asciifx.keys), None when there is none.
+The parsed --key=value options are kept as session.options, and the bare
+--flag arguments (without "--") as session.flags.
+--seed=N seeds the random module, and with it asciifx.rng and the particle
+fields, so a headless run repeats byte for byte.
+
+LiveSession.size() does not ask the terminal every frame: a SIGWINCH
+handler marks the size stale, and it is read again once no resize signal
+has come for SETTLE seconds, so dragging a window edge gives one new size
+(and one rebuild in the loop) instead of dozens.  Without SIGWINCH the
+size is polled every SETTLE seconds.  curses programs keep their own
+handler; they should not call size().
+
+Loops use the session like this:
+
+    with session:
+        while True:
+            width, height = session.size()
+            ...draw to sys.stdout...
+            if not session.end_frame():
+                break
+            session.sleep(delay)
+"""
+
+import json
+import random
+import shutil
+import signal
+import sys
+import threading
+import time
+
+from asciifx.keys import keys_from_options
+from asciifx.profiler import profiler_from_options
+from asciifx.writer import FrameWriter
+
+SETTLE = 0.12  # seconds without a resize signal before the new size is read
+
+
+class LiveSession:
+    headless = False
+    options = {}  # --key=value command-line options, see session_from_argv
+    flags = frozenset()  # bare --flag arguments, without the dashes
+    first_frame = None  # perf_counter() when the first frame was finished
+    audio = None  # asciifx.audio.AudioInput for --audio=SRC
+    keys = None  # asciifx.keys input; "q" ends the loop at end_frame()
+
+    def __init__(self, profiler=None, writer_depth=1, stats=False):
+        self.start = time.monotonic()
+        self.stats = stats  # print the writer's counters on exit
+        self.profiler = profiler  # asciifx.profiler.FrameProfiler or None
+        self.writer_depth = writer_depth  # 0: no background writer
+        self.writer = None
+        self._stdout = None
+        self._size = None
+        self._stale_since = None  # time of the last SIGWINCH not yet read
+        self._checked = 0.0  # when the size was last read (no SIGWINCH)
+        self._old_handler = None
+        self.resizes = 0
+
+    def __enter__(self):
+        if self.writer_depth:
+            self._stdout = sys.stdout
+            self.writer = sys.stdout = FrameWriter(sys.stdout, self.writer_depth)
+        if self.keys:
+            self.keys.open()
+        return self
+
+    def __exit__(self, *exc):
+        if self.keys:
+            self.keys.close()
+        if self._old_handler is not None:
+            signal.signal(signal.SIGWINCH, self._old_handler)
+            self._old_handler = None
+        if self.writer:
+            sys.stdout = self._stdout
+            self.writer.close()
+            if self.stats:
+                print(self.writer.summary())
+        if self.stats:
+            print(f"resizes: {self.resizes}")
+        if self.profiler:
+            self.profiler.close()
+        if self.audio:
+            self.audio.close()
+        return False
+
+    def size(self, fallback=(120, 50)):
+        now = time.monotonic()
+        if self._size is None:
+            self._watch_resize()
+        elif self._old_handler is not None:
+            if self._stale_since is None or now - self._stale_since < SETTLE:
+                return self._size  # unchanged, or still being resized
+        elif now - self._checked < SETTLE:
+            return self._size
+        self._stale_since = None
+        self._checked = now
+        size = tuple(shutil.get_terminal_size(fallback))
+        if self._size is not None and size != self._size:
+            self.resizes += 1
+        self._size = size
+        return size
+
+    def _watch_resize(self):
+        # signal handlers can only be set from the main thread
+        if not hasattr(signal, "SIGWINCH") or threading.current_thread() is not threading.main_thread():
+            return
+        self._old_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+
+    def _on_resize(self, signum, frame):
+        # every signal of a drag restarts the settle time
+        self._stale_since = time.monotonic()
+
+    def now(self):
+        # seconds since the session started
+        return time.monotonic() - self.start
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def end_frame(self):
+        if self.writer:
+            self.writer.end_frame()
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter()
+        return not (self.keys and self.keys.quit)
+
+
+class NullSink:
+    # discards output, counting what would have been written
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def end_frame(self, t):
+        pass
+
+    def close(self):
+        pass
+
+
+class CastSink(NullSink):
+    """asciicast v2: a JSON header line, then one [time, "o", data] event per frame."""
+
+    def __init__(self, path, width, height):
+        super().__init__()
+        self.file = open(path, "w", encoding="utf-8")
+        header = {"version": 2, "width": width, "height": height,
+                  "timestamp": int(time.time()), "env": {"TERM": "xterm-256color"}}
+        self.file.write(json.dumps(header) + "\n")
+        self.pending = []
+        self.last = 0.0
+
+    def write(self, data):
+        self.pending.append(data)
+        return super().write(data)
+
+    def end_frame(self, t):
+        if self.pending:
+            self.file.write(json.dumps([round(t, 6), "o", "".join(self.pending)]) + "\n")
+            self.pending = []
+        self.last = t
+
+    def close(self):
+        self.end_frame(self.last)  # whatever was printed after the last frame
+        self.file.close()
+
+
+class HeadlessSession:
+    headless = True
+    options = {}
+    flags = frozenset()
+    first_frame = None
+    audio = None
+    keys = None
+
+    def __init__(self, width, height, frames=300, cast=None, quiet=False, profiler=None):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.frame = 0
+        self.clock = 0.0
+        self.sink = CastSink(cast, width, height) if cast else NullSink()
+        self.quiet = quiet
+        self.profiler = profiler
+        self.frame_times = []  # wall seconds per frame
+        self.elapsed = 0.0
+        self._stdout = None
+        self._started = None
+        self._last = None
+
+    def __enter__(self):
+        # everything the loop prints goes to the sink
+        self._stdout = sys.stdout
+        sys.stdout = self.sink
+        self._started = self._last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._started
+        sys.stdout = self._stdout
+        self.sink.close()
+        if self.profiler:
+            self.profiler.close()
+        if self.audio:
+            self.audio.close()
+        if not self.quiet:
+            print(self.report(self.elapsed), file=sys.stderr)
+            if self.profiler:
+                print(self.profiler.summary(), file=sys.stderr)
+        return False
+
+    def size(self, fallback=None):
+        return self.width, self.height
+
+    def now(self):
+        return self.clock
+
+    def sleep(self, seconds):
+        # virtual clock: time passes, nobody waits
+        if seconds > 0:
+            self.clock += seconds
+
+    def end_frame(self):
+        now = time.perf_counter()
+        if self.first_frame is None:
+            self.first_frame = now
+        self.frame_times.append(now - self._last)
+        self._last = now
+        self.sink.end_frame(self.clock)
+        self.frame += 1
+        return self.frame < self.frames and not (self.keys and self.keys.quit)
+
+    def report(self, elapsed):
+        fps = self.frame / elapsed if elapsed > 0 else float("inf")
+        per_frame = self.sink.bytes / self.frame if self.frame else 0
+        return (f"headless {self.width}x{self.height}: {self.frame} frames in {elapsed:.2f}s  "
+                f"{fps:.1f} fps  {per_frame:.0f} bytes/frame")
+
+
+def parse_options(argv):
+    # --key=value arguments as a dict
+    opts = {}
+    for arg in argv:
+        if arg.startswith("--") and "=" in arg:
+            key, value = arg[2:].split("=", 1)
+            opts[key] = value
+    return opts
+
+
+def session_from_argv(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    opts = parse_options(argv)
+    profiler = profiler_from_options(argv, opts)
+    if "headless" not in opts:
+        depth = 0 if "--no-writer" in argv else int(opts.get("writer-depth", 1))
+        session = LiveSession(profiler, depth, "--stats" in argv)
+    else:
+        width, height = (int(v) for v in opts["headless"].lower().split("x"))
+        session = HeadlessSession(width, height, int(opts.get("frames", 300)), opts.get("cast"),
+                                  profiler=profiler)
+    if "seed" in opts:
+        # every generator of the run seeds itself from the random module
+        random.seed(int(opts["seed"]))
+    session.options = opts
+    session.flags = frozenset(arg[2:] for arg in argv if arg.startswith("--") and "=" not in arg)
+    session.keys = keys_from_options(argv, opts, session.headless)
+    if "audio" in opts:
+        from asciifx.audio import audio_from_options  # numpy: only when asked for
+        session.audio = audio_from_options(opts)
+    return session
@@ -0,0 +1,124 @@
+"""
+Main loop for the particle effects (supernova 1-4).
+
+The four supernovas run the same frame: poll the keys, follow a resize,
+take the spawn rate from the music and the particle cap from the
+governor, run the fixed physics steps for the time that passed, draw when
+a frame is due, and wait for the next one.  SimLoop does all of that; an
+effect supplies what happens in one physics step and how a frame is drawn:
+
+    loop = SimLoop(session, 0.03, MAX_PARTICLES)
+    with session:
+        loop.run(step, render)     # step(loop), render(loop, behind)
+    if "stats" in session.flags:
+        print(loop.summary())
+
+step() reads loop.width / loop.height (the center follows resizes),
+loop.spawn (the spawn-rate factor: the bass with --audio, times the
+governor's scale with --target-fps) and loop.cap (the particle budget of
+the [ / ] keys, scaled by the governor).  render() draws the particles
+loop.clock.behind() steps back and ends the profiler's frame; loop.show()
+does that for ANSI rows.
+
+A curses effect replaces loop.keys and loop.size with its window's and
+calls loop.resize() before drawing anything.
+"""
+
+from asciifx.encoder import encode_frame
+from asciifx.governor import governor_for
+from asciifx.keys import count_key, speed_key
+from asciifx.scheduler import FrameScheduler
+from asciifx.timestep import FixedStep, render_interval
+
+MIN_BUDGET = 1000  # the [ key goes no lower
+
+
+class SimLoop:
+    def __init__(self, session, dt, budget):
+        self.session = session
+        self.prof = session.profiler
+        self.audio = session.audio
+        self.keys = session.keys
+        self.size = lambda: session.size((80, 24))
+        self.clock = FixedStep.for_session(session, dt)
+        self.sched = FrameScheduler.for_session(session, render_interval(session, self.clock.dt))
+        self.gov = governor_for(session)
+        self.max_budget = self.budget = budget
+        self.speed = 1.0  # + / - keys
+        self.spawn = 1.0
+        self.cap = budget
+        self.width = self.height = None
+        self.resize()
+
+    def resize(self):
+        # follow resizes; the session reports each settled size once
+        size = self.size()
+        if size == (self.width, self.height):
+            return False
+        self.width, self.height = size
+        return True
+
+    def run(self, step, render, resized=None, until=None):
+        """Run frames until the session ends, a quit key, or until() is true.
+
+        resized(loop) is called after the terminal size changed.
+        """
+        prof, gov, keys, audio, clock = self.prof, self.gov, self.keys, self.audio, self.clock
+        while until is None or not until():
+            if prof:
+                prof.frame()
+            if gov:
+                gov.begin()
+            if keys:
+                for key in keys.poll():
+                    self.speed = speed_key(self.speed, key)
+                    self.budget = count_key(self.budget, key, MIN_BUDGET, self.max_budget, 2.0)
+                if keys.quit:
+                    break
+            if self.resize() and resized:
+                resized(self)
+
+            self.spawn = 1.0  # --audio=SRC: bursts follow the bass
+            if audio:
+                audio.update(self.session.now())
+                self.spawn = audio.map("bass", 0.25, 4.0)
+            self.cap = self.budget
+            if gov:  # --target-fps: fewer and smaller bursts under load
+                self.spawn *= gov.scale
+                self.cap = gov.cap(self.budget)
+
+            # fixed physics steps for the time that passed (asciifx.timestep)
+            for _ in range(clock.advance(self.speed)):
+                step(self)
+            if prof:
+                prof.lap("sim")
+
+            if clock.render_due():
+                render(self, clock.behind())
+            elif prof:
+                prof.end_frame()  # behind: the time went to the simulation
+            if not self.session.end_frame():
+                break
+            if gov:
+                gov.end()
+            self.sched.wait()
+
+    def show(self, rows, home):
+        # render() for ANSI output: rows from the rasterizer, after home
+        prof = self.prof
+        if prof:
+            prof.lap("raster")
+        text = encode_frame(*rows)
+        if prof:
+            prof.lap("encode")
+        print(home, end='')
+        print(text)
+        if prof:
+            prof.lap("write")
+            prof.end_frame(self.width)
+
+    def summary(self):
+        lines = [self.sched.summary(), self.clock.summary()]
+        if self.gov:
+            lines.append(self.gov.summary())
+        return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""
+Fixed-timestep simulation, decoupled from the render rate.
+
+The particle effects used to run one physics step per rendered frame, so
+a slow terminal slowed the simulation down with it.  FixedStep keeps an
+accumulator of simulated time instead: each frame adds the wall time that
+passed (times the speed factor), and the loop runs one step per dt in it.
+
+    clock = FixedStep.for_session(session, 0.03)
+    while True:
+        for _ in range(clock.advance(speed)):
+            ...one physics step...
+        if clock.render_due():
+            ...draw, at clock.behind() steps back when interpolating...
+        sched.wait()
+
+Per frame at most max_steps steps run; the rest stays in the accumulator
+and is worked off over the next frames, so simulated time stays exact
+against wall time.  While the simulation is behind, render_due() skips
+drawing (at most max_skip frames in a row) to give it the time.  Only a
+backlog beyond max_lag seconds is dropped; summary() reports it.
+
+The physics of the effects are per step, so dt sets the pace too: the
+default is each effect's original frame period.
+
+    --sim-hz=33.3       simulation steps per second
+    --fps=20            frames rendered per second (default: the sim rate)
+    --max-substeps=5    steps per frame at most
+    --interpolate       draw particles between their last two steps
+"""
+
+
+class FixedStep:
+    def __init__(self, session, dt, max_steps=5, max_skip=4, max_lag=0.5, interpolate=False):
+        self.now = session.now
+        self.dt = dt
+        self.max_steps = max_steps
+        self.max_skip = max_skip
+        self.max_lag = max_lag
+        self.interpolate = interpolate
+        self.last = None
+        self.acc = 0.0       # simulated seconds not stepped yet
+        self.steps = 0
+        self.frames = 0
+        self.rendered = 0
+        self.skipped = 0     # frames not drawn while behind
+        self.capped = 0      # frames that hit max_steps
+        self.lag_dropped = 0.0
+        self._skip_run = 0
+
+    @classmethod
+    def for_session(cls, session, dt):
+        opts = session.options
+        if "sim-hz" in opts:
+            dt = 1.0 / float(opts["sim-hz"])
+        return cls(session, dt, int(opts.get("max-substeps", 5)),
+                   interpolate="interpolate" in session.flags)
+
+    def advance(self, speed=1.0):
+        """Add the time since the last call; return the steps to run now."""
+        now = self.now()
+        if self.last is None:
+            self.last = now
+        self.acc += (now - self.last) * speed
+        self.last = now
+        self.frames += 1
+        steps = int((self.acc + 1e-9) // self.dt)  # not 0.0299999 // 0.03
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.capped += 1
+        self.acc -= steps * self.dt
+        if self.acc > self.max_lag:
+            # too far behind to catch up: let that time go
+            keep = self.acc % self.dt
+            self.lag_dropped += self.acc - keep
+            self.acc = keep
+        self.steps += steps
+        return steps
+
+    def render_due(self):
+        # skip drawing while whole steps are still waiting, but not for long
+        if self.acc >= self.dt and self._skip_run < self.max_skip:
+            self._skip_run += 1
+            self.skipped += 1
+            return False
+        self._skip_run = 0
+        self.rendered += 1
+        return True
+
+    def behind(self):
+        # how many steps back to draw positions: 0 at the newest step, up to
+        # 1 at the one before (position - velocity * behind)
+        if not self.interpolate:
+            return 0.0
+        return 1.0 - min(1.0, self.acc / self.dt)
+
+    def summary(self):
+        frames = self.frames or 1
+        return (f"sim: {self.steps} steps at {1 / self.dt:.1f} Hz  "
+                f"steps/frame: {self.steps / frames:.2f}  rendered: {self.rendered}  "
+                f"skipped: {self.skipped}  capped: {self.capped}  "
+                f"lag dropped: {self.lag_dropped:.2f} s")
+
+
+def render_interval(session, default):
+    # seconds per rendered frame: --fps=N, else the default
+    fps = session.options.get("fps")
+    return 1.0 / float(fps) if fps else default
@@ -0,0 +1,117 @@
+"""
+Background output stage.
+
+FrameWriter stands in for sys.stdout while an animation runs: the render
+thread's writes are collected until end_frame(), then the finished frame
+goes into a bounded queue (depth 1 or 2) and a dedicated thread writes and
+flushes it.  A slow terminal then no longer stalls the simulation.  When
+the queue is full the oldest unwritten frame is dropped for the new one
+and counted as superseded.
+
+Dropping a frame is only safe when the frame after it does not depend on
+what it drew.  Full repaints never do; ScreenBuffer checks
+output_pending() and renders a full frame instead of a diff while an
+earlier frame is still waiting, so a diff never replaces anything.
+
+Terminal state changes that are not part of a frame's picture (clearing
+the screen, hiding the cursor) go through write_control() instead of
+write(): they travel with their frame, and when that frame is dropped
+they are carried over to the one that replaces it.
+"""
+
+import sys
+import threading
+from collections import deque
+
+
+class FrameWriter:
+    def __init__(self, stream, depth=1):
+        if depth not in (1, 2):
+            raise ValueError("writer queue depth must be 1 or 2")
+        self.stream = stream
+        self.depth = depth
+        self.parts = []  # writes of the frame being built
+        self.controls = []  # the control writes among them, never dropped
+        self.queue = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.error = None
+        self.frames = 0
+        self.written = 0
+        self.superseded = 0
+        self.thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self.thread.start()
+
+    # file interface for the render thread
+    def write(self, data):
+        self.parts.append(data)
+        return len(data)
+
+    def control(self, data):
+        self.parts.append(data)
+        self.controls.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def end_frame(self):
+        if self.error:
+            raise self.error
+        if not self.parts:
+            return
+        text, controls = "".join(self.parts), "".join(self.controls)
+        self.parts, self.controls = [], []
+        with self.cond:
+            if len(self.queue) >= self.depth:
+                # drop the picture, keep its control output
+                _, kept = self.queue.popleft()
+                text, controls = kept + text, kept + controls
+                self.superseded += 1
+            self.queue.append((text, controls))
+            self.frames += 1
+            self.cond.notify()
+
+    def output_pending(self):
+        # a finished frame is waiting and may still be superseded
+        return bool(self.queue)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue and not self.closed:
+                    self.cond.wait()
+                if not self.queue:
+                    return
+                frame, _ = self.queue.popleft()
+            try:
+                self.stream.write(frame)
+                self.stream.flush()
+            except OSError as e:  # e.g. the terminal went away
+                self.error = e
+                return
+            self.written += 1
+
+    def close(self):
+        # write whatever is left, in order, and stop the thread
+        with self.cond:
+            if self.parts:
+                self.queue.append(("".join(self.parts), ""))  # never dropped
+                self.parts, self.controls = [], []
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
+
+    def summary(self):
+        return f"frames: {self.frames}  written: {self.written}  superseded: {self.superseded}"
+
+
+def write_control(data, stream=None):
+    # clear screen, cursor visibility and the like: kept even when the frame
+    # they were written in is superseded (see FrameWriter)
+    stream = sys.stdout if stream is None else stream
+    control = getattr(stream, "control", None)
+    if control is not None:
+        control(data)
+    else:
+        stream.write(data)
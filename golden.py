@@ -1,15 +1,17 @@
-import math, os, sys, time, shutil, colorsys
+import math, sys
 
-# ---- Color handling ----
-def hsv_to_ansi(h, s, v):
-    r, g, b = [int(x * 5) for x in colorsys.hsv_to_rgb(h % 1.0, s, v)]
-    return 16 + 36*r + 6*g + b
+from asciifx.encoder import encode_frame
+from asciifx.keys import speed_key
+from asciifx.palette import color_table
+from asciifx.polar import polar_grid
+from asciifx.scheduler import FrameScheduler
+from asciifx.session import session_from_argv
 
 def clear():
     sys.stdout.write("\033[H\033[J")
 
 # ---- Spiral drawing ----
-def draw_spiral(t, cols, rows):
+def draw_spiral(t, cols, rows, prof=None):
     cx, cy = cols // 2, rows // 2
     frame = [[' ' for _ in range(cols)] for _ in range(rows)]
 
@@ -33,36 +35,56 @@ def draw_spiral(t, cols, rows):
             frame[y][x] = chars[int((i / (max_theta / step)) * density)]
 
     # ---- Render with color phase ----
-    output = []
+    colors = [[""] * cols for _ in range(rows)]
     color_phase = (t * 0.25) % 1.0
+    palette = color_table("256")
+    grid = polar_grid(cols, rows, center=(cx, cy))
     for y in range(rows):
+        angle_row = grid.angle[y]
         for x in range(cols):
-            ch = frame[y][x]
-            if ch != ' ':
-                angle = math.atan2(y - cy, x - cx)
+            if frame[y][x] != ' ':
+                angle = angle_row[x]
                 hue = ((angle / (2 * math.pi)) + color_phase) % 1.0
-                color = hsv_to_ansi(hue, 1.0, 1.0)
-                output.append(f"\033[38;5;{color}m{ch}")
-            else:
-                output.append(" ")
-        output.append("\033[0m\n")
+                colors[y][x] = palette.lookup(hue, 1.0, 1.0)
 
-    sys.stdout.write(''.join(output))
+    if prof:
+        prof.lap("raster")
+    text = encode_frame(frame, colors) + "\n"
+    if prof:
+        prof.lap("encode")
+    sys.stdout.write(text)
     sys.stdout.flush()
+    if prof:
+        prof.lap("write")
 
 # ---- Main loop ----
-def main():
+def main(session=None):
+    session = session or session_from_argv()
+    prof = session.profiler
+    sched = FrameScheduler.for_session(session, 0.05)
+    keys = session.keys
+    speed = 1.0  # + / - keys
     try:
-        t = 0
-        while True:
-            cols, rows = shutil.get_terminal_size()
-            clear()
-            draw_spiral(t, cols, rows)
-            t += 0.07
-            time.sleep(0.05)
+        with session:
+            t = 0
+            while True:
+                if prof:
+                    prof.frame()
+                if keys:
+                    for key in keys.poll():
+                        speed = speed_key(speed, key)
+                cols, rows = session.size()
+                clear()
+                draw_spiral(t, cols, rows, prof)
+                if prof:
+                    prof.end_frame(cols)
+                if not session.end_frame():
+                    break
+                t += 0.07 * speed * sched.wait()  # skipped frames still advance the spin
     except KeyboardInterrupt:
         clear()
-        sys.exit(0)
+    if "stats" in session.flags:
+        print(sched.summary())
 
 if __name__ == "__main__":
     main()
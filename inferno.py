@@ -2,78 +2,36 @@
 """
 spiral_from_ascii.py
 
-Pre-rendered large ASCII art (vortex) is embedded below. This script scales the art
+Pre-rendered large ASCII art (vortex, see asciifx/art.py). This script scales the art
 to your terminal, and animates it into a counter-clockwise spiral with dynamic
 tie-dye truecolor (or 256-color fallback). Background color is unchanged.
 
 Usage:
     python3 spiral_from_ascii.py
     python3 spiral_from_ascii.py --256   # force 256-color fallback
+    python3 spiral_from_ascii.py --backend=loop   # per-cell reference renderer
+    python3 spiral_from_ascii.py --workers=auto   # render bands on all cores
+    python3 spiral_from_ascii.py --audio=song.wav # react to music (see asciifx.audio)
 
 Ctrl+C to quit.
 """
 
-import os, sys, time, math, shutil, signal
+import os, sys, math, signal
 
-# -------------------------
-# PRE-RENDERED ASCII ART
-# (Large, bright vortex; the two shadow figures removed)
-# Width ~120 cols, Height ~46 rows (will be scaled to fit terminal)
-# -------------------------
-ART = r"""
-........................................................................................................
-...........................................:::::::=*#%@@%#*+=:..........................................
-.....................................:::::::-=+*#%@@@@@@@@@@@@%#*+=-:...................................
-..................................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@%#*+=-::..............................
-...............................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::.........................
-.............................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::...................
-...........................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::...............
-.........................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::.............
-.......................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::..........
-......................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:......
-....................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:....
-...................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:
-..................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=
-.................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#
-................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-...............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-..............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-.............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%
-............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@
-...........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@
-..........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.......:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-......:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.....:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-....:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-...:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-..:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.:::::::-=+*#%@@@@@@@@@@@%%%%%%%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-..:::::::-=+*#%@@@@@%*=-:......:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-...:::::::-=+*#%@@#=:..............:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-....:::::::-=+*#*=:....................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.....:::::::-=+*=-:......................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-......:::::::-=+:-:........................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@
-.......:::::::-:............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@
-........:::::::-:.............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@
-.........:::::::::..............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@
-..........:::::::::...............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@
-...........::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@
-............:::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@
-.............:::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@
-..............::::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@@@@
-...............:::::::::::::::::.................................:-=+*#%@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@@@@@
-................::::::::::::::::::.................................:-=+*#%@@@@@%@@@@@@@@@@@@@@@@@@@@@@@@@
-.................:::::::::::::::::::::.................................:-=+*#%@@%@@@@@@@@@@@@@@@@@@@@@@@@@
-..................::::::::::::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@
-....................:::::::::::::::::::::::................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@
-........................................................................................................
-"""  # end ART
+try:
+    import numpy as np
+except ImportError:  # optional: without numpy only the "loop" backend is available
+    np = None
+
+from asciifx.art import load_art, scale_art
+from asciifx.bands import pool_for
+from asciifx.encoder import encode_frame
+from asciifx.keys import speed_key
+from asciifx.palette import color_table
+from asciifx.polar import polar_grid
+from asciifx.scheduler import FrameScheduler
+from asciifx.session import session_from_argv
+from asciifx.writer import write_control
 
 # -------------------------
 # Terminal/color utilities
@@ -86,70 +44,26 @@ def supports_truecolor():
     return True
 
 def hide_cursor():
-    sys.stdout.write("\033[?25l")
+    write_control("\033[?25l")
 def show_cursor():
-    sys.stdout.write("\033[?25h")
+    write_control("\033[?25h")
 def move_cursor_home():
     sys.stdout.write("\033[H")
 def clear_screen():
-    sys.stdout.write("\033[2J")
+    write_control("\033[2J")
 def flush():
     sys.stdout.flush()
 
-# convert hsv (0..1) to RGB (0..255)
-def hsv_to_rgb(h, s, v):
-    if s == 0.0:
-        r = g = b = int(v * 255)
-        return r, g, b
-    i = int(h * 6.0)  # assume h in [0,1)
-    f = (h * 6.0) - i
-    p = v * (1.0 - s)
-    q = v * (1.0 - s * f)
-    t = v * (1.0 - s * (1.0 - f))
-    i = i % 6
-    if i == 0:
-        r, g, b = v, t, p
-    elif i == 1:
-        r, g, b = q, v, p
-    elif i == 2:
-        r, g, b = p, v, t
-    elif i == 3:
-        r, g, b = p, q, v
-    elif i == 4:
-        r, g, b = t, p, v
-    else:
-        r, g, b = v, p, q
-    return int(r * 255), int(g * 255), int(b * 255)
-
-def rgb_to_truecolor_seq(r,g,b):
-    return f"\033[38;2;{r};{g};{b}m"
-
-def rgb_to_256(r,g,b):
-    # map 0..255 to xterm 256 cube 16..231
-    r6 = int((r/255.0)*5 + 0.5)
-    g6 = int((g/255.0)*5 + 0.5)
-    b6 = int((b/255.0)*5 + 0.5)
-    code = 16 + 36*r6 + 6*g6 + b6
-    return f"\033[38;5;{code}m"
-
 # -------------------------
 # ASCII art processing & scaling
 # -------------------------
-# Convert ART into a 2D list of characters (lines may be ragged -> pad)
-art_lines = [line.rstrip("\n") for line in ART.splitlines() if line.strip("\n") != ""]
-orig_h = len(art_lines)
-orig_w = max(len(line) for line in art_lines)
-# pad lines to same width
-for i in range(len(art_lines)):
-    art_lines[i] = art_lines[i].ljust(orig_w)
+# The vortex art (large, bright; the two shadow figures removed) ships
+# precompiled with asciifx; see asciifx/art.py
+orig_h, orig_w = len(load_art()[0]), len(load_art()[0][0])
 
 # Character cell aspect adjustment (terminal characters are typically taller than wide)
 CHAR_ASPECT = 0.5  # approximate width/height ratio for chars (tweak if needed)
 
-def get_terminal_size():
-    cols, rows = shutil.get_terminal_size((80,24))
-    return cols, rows
-
 def scale_art_to_terminal(cols, rows):
     # rows: available rows for art (we'll reserve 1 row for status)
     # We want art to nearly fill the terminal width (outer arms nearly touching edges).
@@ -166,119 +80,214 @@ def scale_art_to_terminal(cols, rows):
     if target_w < 20: target_w = 20
     if target_h < 8: target_h = 8
 
-    # simple nearest-neighbor scale from original art to target_w x target_h
-    scaled = []
-    for y in range(target_h):
-        row_chars = []
-        sy = y / float(max(1, target_h-1)) * (orig_h - 1)
-        sy_i = int(round(sy))
-        for x in range(target_w):
-            sx = x / float(max(1, target_w-1)) * (orig_w - 1)
-            sx_i = int(round(sx))
-            row_chars.append(art_lines[sy_i][sx_i])
-        scaled.append(row_chars)
-    return scaled
+    # nearest-neighbor scale to target_w x target_h (row strings)
+    return scale_art(target_w, target_h, "round")
 
 # -------------------------
 # Spiral transform & animation
 # -------------------------
-def run_animation(force_256=False):
+# Two interchangeable frame backends: "loop" is the original per-cell
+# reference implementation, "numpy" computes the same warp field, art lookup
+# and tie-dye color for the whole frame at once.  Both return (glyph rows,
+# color rows) for asciifx.encoder and must produce identical frames.
+# rows=(y0, y1) renders only that band of the frame (see render_band).
+def render_rows_loop(base_chars, t, use_true, swirl_speed, spiral_strength, outward_speed, rows=None):
+    H = len(base_chars)
+    W = len(base_chars[0])
+    grid = polar_grid(W, H)
+    cx, cy, max_r = grid.cx, grid.cy, grid.max_r
+    table = color_table("truecolor" if use_true else "256")
+
+    y0, y1 = rows or (0, H)
+    glyph_rows, color_rows = [], []
+    for y in range(y0, y1):
+        glyphs, colors = [], []
+        rnorm_row = grid.rnorm[y]
+        angle_row = grid.angle[y]
+        for x in range(W):
+            # Normalized polar coords from center (cached per geometry)
+            r = rnorm_row[x]
+            ang = angle_row[x]
+
+            # Outward radial motion
+            r_out = (r + outward_speed * t) % 1.0
+
+            # Spiral rotation (counter-clockwise)
+            rot = swirl_speed * t + r_out * spiral_strength
+            new_ang = ang - rot + math.sin(t*0.8 + r_out*10.0)*0.2
+
+            # Map back to Cartesian coordinates
+            rx_new = r_out * max_r * math.cos(new_ang)
+            ry_new = r_out * max_r * math.sin(new_ang)
+            x_disp = int(round(cx + rx_new))
+            y_disp = int(round(cy + ry_new))
+
+            # Sample ASCII character
+            if 0 <= x_disp < W and 0 <= y_disp < H:
+                ch = base_chars[y_disp][x_disp]
+            else:
+                ch = " "
+
+            # Skip spaces for performance
+            if ch == " ":
+                glyphs.append(" ")
+                colors.append("")
+                continue
+
+            # Color calculation (tie-dye effect)
+            hue = ((new_ang / (2*math.pi)) + (t*0.08) + (r_out*2.5)) % 1.0
+            sat = max(0.2, min(1.0, 0.9 - r_out*0.6))
+            val = max(0.15, min(1.0, 0.85 - 0.25*(1.0 - r_out) + 0.12*math.sin(t*2.0 + r_out*15.0)))
+            glyphs.append(ch)
+            colors.append(table.lookup(hue, sat, val))
+        glyph_rows.append(glyphs)
+        color_rows.append(colors)
+    return glyph_rows, color_rows
+
+def render_rows_numpy(art, t, use_true, swirl_speed, spiral_strength, outward_speed, rows=None):
+    # art: 2D array of single characters (see art_to_array)
+    H, W = art.shape
+    grid = polar_grid(W, H)
+    cx, cy, max_r = grid.cx, grid.cy, grid.max_r
+    _, ang, r = grid.arrays()
+    if rows:
+        ang, r = ang[rows[0]:rows[1]], r[rows[0]:rows[1]]
+
+    r_out = (r + outward_speed * t) % 1.0
+    rot = swirl_speed * t + r_out * spiral_strength
+    new_ang = ang - rot + np.sin(t*0.8 + r_out*10.0)*0.2
+
+    x_disp = np.rint(cx + r_out * max_r * np.cos(new_ang)).astype(np.int64)
+    y_disp = np.rint(cy + r_out * max_r * np.sin(new_ang)).astype(np.int64)
+    inside = (x_disp >= 0) & (x_disp < W) & (y_disp >= 0) & (y_disp < H)
+    ch = np.where(inside, art[np.clip(y_disp, 0, H - 1), np.clip(x_disp, 0, W - 1)], " ")
+
+    hue = ((new_ang / (2*math.pi)) + (t*0.08) + (r_out*2.5)) % 1.0
+    sat = np.clip(0.9 - r_out*0.6, 0.2, 1.0)
+    val = np.clip(0.85 - 0.25*(1.0 - r_out) + 0.12*np.sin(t*2.0 + r_out*15.0), 0.15, 1.0)
+    table = color_table("truecolor" if use_true else "256")
+    index = table.index_array(hue, sat, val)
+    seqs, entry = table.table, table.entry
+
+    glyph_rows = ch.tolist()
+    color_rows = []
+    for row, idx in zip(glyph_rows, index.tolist()):
+        color_rows.append(["" if c == " " else seqs[i] or entry(i) for c, i in zip(row, idx)])
+    return glyph_rows, color_rows
+
+def art_to_array(base_chars):
+    # row strings -> 2D array of single characters
+    return np.array(base_chars).view("<U1").reshape(len(base_chars), -1)
+
+BACKENDS = {"loop": render_rows_loop}
+if np is not None:
+    BACKENDS["numpy"] = render_rows_numpy
+
+def render_band(state, frame, y0, y1):
+    # one band of the frame, encoded; runs in an asciifx.bands worker
+    art, use_true, backend = state
+    t, params = frame
+    glyph_rows, color_rows = BACKENDS[backend](art, t, use_true, *params, rows=(y0, y1))
+    return encode_frame(glyph_rows, color_rows)
+
+def run_animation(force_256=False, backend=None, session=None):
+    if backend is None:
+        backend = "numpy" if np is not None else "loop"
+    if backend not in BACKENDS:
+        hint = " (needs numpy)" if backend == "numpy" else ""
+        raise ValueError(f"backend {backend!r} is not available{hint}; "
+                         f"choose from: {', '.join(BACKENDS)}")
+    session = session or session_from_argv()
+    prof = session.profiler
     use_true = supports_truecolor() and not force_256
-    cols, rows = get_terminal_size()
+    render_rows = BACKENDS[backend]
+    cols, rows = session.size((80, 24))
     rows_avail = rows
     scaled = scale_art_to_terminal(cols, rows_avail)
 
-    H = len(scaled)
-    W = len(scaled[0])
-    cx = (W - 1) / 2.0
-    cy = (H - 1) / 2.0
-    max_r = math.hypot(cx, cy)
-
     FPS = 20.0
     delay = 1.0 / FPS
     swirl_speed = 0.06      # rotation speed
     spiral_strength = 1.2   # how dramatic the spiral distortion is
     outward_speed = 0.25    # how fast the spiral radiates outward
-
-    time0 = time.time()
+    sched = FrameScheduler.for_session(session, delay)
+    params = (swirl_speed, spiral_strength, outward_speed)
+    audio = session.audio  # --audio=SRC: the music drives the swirl
+    keys = session.keys
+    speed = 1.0  # + / - keys; c switches between truecolor and 256 colors
+    t = last = 0.0
 
     # Precompute base characters
-    base_chars = [[scaled[y][x] for x in range(W)] for y in range(H)]
+    base_chars = scaled
+    art = art_to_array(base_chars) if backend == "numpy" else base_chars
+
+    # --workers=N: bands rendered by worker processes (started before the
+    # session's writer thread)
+    pool = pool_for(session, render_band)
+    if pool:
+        pool.setup((art, use_true, backend), len(scaled[0]), len(scaled))
 
-    # Hide cursor + clear
-    hide_cursor()
-    clear_screen()
     try:
-        while True:
-            t = time.time() - time0
-
-            # Handle dynamic resizing
-            new_cols, new_rows = get_terminal_size()
-            if new_cols != cols or new_rows != rows:
-                cols, rows = new_cols, new_rows
-                rows_avail = rows
-                scaled = scale_art_to_terminal(cols, rows_avail)
-                H = len(scaled)
-                W = len(scaled[0])
-                cx = (W - 1) / 2.0
-                cy = (H - 1) / 2.0
-                max_r = math.hypot(cx, cy)
-                base_chars = [[scaled[y][x] for x in range(W)] for y in range(H)]
-
-            move_cursor_home()
-            out_lines = []
-
-            for y in range(H):
-                parts = []
-                for x in range(W):
-                    # Compute normalized polar coords from center
-                    rx = x - cx
-                    ry = y - cy
-                    r = math.hypot(rx, ry) / max_r
-                    ang = math.atan2(ry, rx)
-
-                    # Outward radial motion
-                    r_out = (r + outward_speed * t) % 1.0
-
-                    # Spiral rotation (counter-clockwise)
-                    rot = swirl_speed * t + r_out * spiral_strength
-                    new_ang = ang - rot + math.sin(t*0.8 + r_out*10.0)*0.2
-
-                    # Map back to Cartesian coordinates
-                    rx_new = r_out * max_r * math.cos(new_ang)
-                    ry_new = r_out * max_r * math.sin(new_ang)
-                    x_disp = int(round(cx + rx_new))
-                    y_disp = int(round(cy + ry_new))
-
-                    # Sample ASCII character
-                    if 0 <= x_disp < W and 0 <= y_disp < H:
-                        ch = base_chars[y_disp][x_disp]
-                    else:
-                        ch = " "
-
-                    # Skip spaces for performance
-                    if ch == " ":
-                        parts.append(" ")
-                        continue
-
-                    # Color calculation (tie-dye effect)
-                    hue = ((new_ang / (2*math.pi)) + (t*0.08) + (r_out*2.5)) % 1.0
-                    sat = max(0.2, min(1.0, 0.9 - r_out*0.6))
-                    val = max(0.15, min(1.0, 0.85 - 0.25*(1.0 - r_out) + 0.12*math.sin(t*2.0 + r_out*15.0)))
-                    rcol, gcol, bcol = hsv_to_rgb(hue, sat, val)
-                    if use_true:
-                        seq = rgb_to_truecolor_seq(rcol, gcol, bcol)
-                    else:
-                        seq = rgb_to_256(rcol, gcol, bcol)
-                    parts.append(f"{seq}{ch}\033[0m")
-                out_lines.append("".join(parts))
-            sys.stdout.write("\n".join(out_lines))
-            flush()
-
-            # Sleep for next frame
-            time_spent = (time.time() - time0) - t
-            sleep_time = max(0.0, delay - time_spent)
-            time.sleep(sleep_time)
+        with session:
+            # Hide cursor + clear
+            hide_cursor()
+            clear_screen()
+            while True:
+                if prof:
+                    prof.frame()
+                if keys:
+                    for key in keys.poll():
+                        speed = speed_key(speed, key)
+                        if key == "c":
+                            use_true = not use_true
+                            if pool:
+                                pool.setup((art, use_true, backend), len(scaled[0]), len(scaled))
+                now = session.now()
+                rate = speed
+                if audio:
+                    # loudness sets the pace of the swirl, bass how tightly it winds
+                    audio.update(now)
+                    rate *= audio.map("level", 0.5, 2.5)
+                    params = (swirl_speed, spiral_strength * audio.map("bass", 1.0, 2.0), outward_speed)
+                t += (now - last) * rate
+                last = now
+
+                # Handle dynamic resizing
+                new_cols, new_rows = session.size((80, 24))
+                if new_cols != cols or new_rows != rows:
+                    cols, rows = new_cols, new_rows
+                    rows_avail = rows
+                    scaled = scale_art_to_terminal(cols, rows_avail)
+                    base_chars = scaled
+                    art = art_to_array(base_chars) if backend == "numpy" else base_chars
+                    if pool:
+                        pool.setup((art, use_true, backend), len(scaled[0]), len(scaled))
+
+                move_cursor_home()
+                if pool:
+                    bands = pool.render((t, params))  # rasterized and encoded by the workers
+                    if prof:
+                        prof.lap("raster")
+                    text = "\n".join(bands)
+                else:
+                    glyph_rows, color_rows = render_rows(art, t, use_true, *params)
+                    if prof:
+                        prof.lap("raster")
+                    text = encode_frame(glyph_rows, color_rows)
+                if prof:
+                    prof.lap("encode")
+                sys.stdout.write(text)
+                flush()
+                if prof:
+                    prof.lap("write")
+                    prof.end_frame(cols)
+                if not session.end_frame():
+                    break
+
+                # Sleep until the next frame is due (t follows the clock,
+                # so skipped frames need no catching up)
+                sched.wait()
+            show_cursor()
 
     except KeyboardInterrupt:
         move_cursor_home()
@@ -289,18 +298,28 @@ def run_animation(force_256=False):
         show_cursor()
         clear_screen()
         raise
+    finally:
+        if pool:
+            pool.close()
+    if "stats" in session.flags:
+        print(sched.summary())
                     
 
 # -------------------------
 # Entry point
 # -------------------------
-if __name__ == "__main__":
-    force256 = ("--256" in sys.argv)
+def main(session=None):
+    session = session or session_from_argv()
+    force256 = "256" in session.flags
+    backend = session.options.get("backend")  # numpy when available, else loop
     # handle SIGWINCH on Unix (terminal resize) gracefully by continuing loop which re-checks size
     try:
-        run_animation(force256)
+        run_animation(force256, backend, session)
     except Exception as e:
         show_cursor()
         clear_screen()
         print("Error:", e)
         sys.exit(1)
+
+if __name__ == "__main__":
+    main()
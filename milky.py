@@ -2,11 +2,18 @@
 # milky_way_ascii_responsive.py — Animated Milky Way, adjusts to terminal size
 
 import math
-import time
-import shutil
 import sys
 import random
 
+from asciifx.encoder import FG_256
+from asciifx.governor import governor_for
+from asciifx.keys import speed_key
+from asciifx.rng import BatchRandom
+from asciifx.screen import ScreenBuffer
+from asciifx.scheduler import FrameScheduler
+from asciifx.session import session_from_argv
+from asciifx.writer import write_control
+
 chars = " .:-=+*#%@"
 frame_delay = 0.05
 vertical_squash = 0.25
@@ -20,8 +27,11 @@ rotation_speed_core = 0.08
 rotation_speed_outer = 0.02
 rotation_direction = 1  # 1 = CCW, -1 = CW
 
+back_buffer = ScreenBuffer()  # only changed cells are rewritten each frame
+rng = BatchRandom()  # the frame's depth jitter in one draw
+
 def clear_screen():
-    sys.stdout.write("\033[2J\033[H")
+    write_control("\033[2J\033[H")
     sys.stdout.flush()
 
 def generate_stars():
@@ -47,51 +57,79 @@ def generate_stars():
 
         stars.append({
             "r_frac": r_frac,  # store as fraction of max radius
-            "theta": theta,
+            "theta": theta,    # at phase 0
+            "speed": rotation_speed_core * (1 - r_frac) + rotation_speed_outer * r_frac,
             "depth": depth,
             "char": ch
         })
     return stars
 
-def draw_frame(stars):
-    size = shutil.get_terminal_size(fallback=(120,50))
-    width, height = size.columns, size.lines
+# phase is the rotation so far in frame steps; visible draws only the first
+# that many stars (they are in random order, so any prefix is spread evenly)
+def draw_frame(stars, width, height, phase, visible=None):
     cx, cy = width//2, height//2
     max_radius = min(cx, int(cy/vertical_squash)) - 2
 
     screen = [[" "]*width for _ in range(height)]
+    colors = [[""]*width for _ in range(height)]
 
-    for star in stars:
+    shown = stars[:visible]
+    for star, jitter in zip(shown, rng.uniform(-0.02, 0.02, len(shown))):
         r = star["r_frac"] * max_radius
-        speed = rotation_speed_core * (1 - star["r_frac"]) + rotation_speed_outer * star["r_frac"]
-        star["theta"] -= rotation_direction * speed
+        theta = star["theta"] - rotation_direction * star["speed"] * phase
 
-        x = cx + r * math.cos(star["theta"])
-        y = cy + r * math.sin(star["theta"]) * vertical_squash
+        x = cx + r * math.cos(theta)
+        y = cy + r * math.sin(theta) * vertical_squash
 
         sx, sy = int(round(x)), int(round(y))
         if 0 <= sx < width and 0 <= sy < height:
-            depth = min(1.0, max(0.0, star["depth"] + random.uniform(-0.02, 0.02)))
+            depth = min(1.0, max(0.0, star["depth"] + jitter))
             char_idx = int(depth * (len(chars)-1))
             ch = chars[char_idx]
             color = 16 + int(depth*215)
-            screen[sy][sx] = f"\033[38;5;{color}m{ch}\033[0m"
+            screen[sy][sx] = ch
+            colors[sy][sx] = FG_256[color]
 
-    sys.stdout.write("\033[H")
-    for row in screen:
-        sys.stdout.write("".join(row) + "\n")
-    sys.stdout.flush()
+    back_buffer.present(screen, colors)
 
-def main():
-    clear_screen()
+def main(session=None):
+    session = session or session_from_argv()
+    prof = back_buffer.profiler = session.profiler
+    sched = FrameScheduler.for_session(session, frame_delay)
     stars = generate_stars()
+    steps = 1  # frame steps since the last frame drawn
+    phase = 0.0
+    keys = session.keys
+    gov = governor_for(session)  # --target-fps: fewer stars under load
+    speed = 1.0  # + / - keys
     try:
-        while True:
-            draw_frame(stars)
-            time.sleep(frame_delay)
+        with session:
+            clear_screen()
+            while True:
+                if prof:
+                    prof.frame()
+                if gov:
+                    gov.begin()
+                if keys:
+                    for key in keys.poll():
+                        speed = speed_key(speed, key)
+                width, height = session.size()
+                phase += steps * speed
+                draw_frame(stars, width, height, phase, gov.cap(len(stars)) if gov else None)
+                if prof:
+                    prof.end_frame(width)
+                if not session.end_frame():
+                    break
+                if gov:
+                    gov.end()
+                steps = sched.wait()
     except KeyboardInterrupt:
         sys.stdout.write("\033[0m\n")
-        sys.exit()
+    if "stats" in session.flags:
+        print(back_buffer.summary())
+        print(sched.summary())
+        if gov:
+            print(gov.summary())
 
 if __name__ == "__main__":
     main()
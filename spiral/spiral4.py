@@ -3,69 +3,75 @@
 # Usage: python3 hypnotic_spiral_circle.py
 
 import math
-import time
-import shutil
 import sys
+import os
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.cycle import play
+from asciifx.encoder import FG_256
+from asciifx.framecache import cache_for, loop_frames
+from asciifx.screen import ScreenBuffer
+from asciifx.session import session_from_argv
+from asciifx.spiral import SpiralRaster, arc_length_samples, circle_radius
 
 # Spiral settings
 chars = " .:-=+*#%@"
 turns = 30             # more revolutions for depth
-points_per_turn = 600  # smoother spiral
+oversample = 1.0       # samples per cell along the curve (arc-length spacing)
 phase_speed = -0.05    # counter-clockwise
 frame_delay = 0.03
 vertical_squash = 0.55  # adjust for terminal font aspect ratio
 
-def clear_screen():
-    sys.stdout.write("\033[2J\033[H")
-    sys.stdout.flush()
-
-def draw_spiral_frame(phase):
-    # Terminal size per frame
-    size = shutil.get_terminal_size(fallback=(120, 50))
-    width, height = size.columns, size.lines
-    cx, cy = width // 2, height // 2
-
-    # True circular max radius
-    max_radius = min(cx, int(cy / vertical_squash)) - 1
+back_buffer = ScreenBuffer()  # only changed cells are rewritten each frame
+sampler_stats = {"frames": 0, "samples": 0, "duplicates": 0}
 
-    total_points = turns * points_per_turn
-    screen = [[" "]*width for _ in range(height)]
-
-    for i in range(total_points):
-        t = i / total_points  # normalized distance from center
-        angle = 2 * math.pi * (i / points_per_turn) + phase
-        radius = t * max_radius
+@lru_cache(maxsize=4)
+def spiral_geometry(width, height):
+    # the curve only changes with the terminal size; frames just rotate it.
+    # Samples are spaced by arc length so each crossed cell gets about one.
+    max_radius = circle_radius(width, height, vertical_squash)
+    ts = arc_length_samples(turns, max_radius, oversample)
+    raster = SpiralRaster([2 * math.pi * turns * t for t in ts], width, height, vertical_squash)
+    radii, cells = [], []
+    for t in ts:  # t: normalized distance from center
+        radii.append(t * max_radius)
 
-        x = cx + radius * math.cos(angle)
-        y = cy + radius * math.sin(angle) * vertical_squash
-        sx, sy = int(round(x)), int(round(y))
+        # taper ASCII toward edges
+        depth_factor = 1 - t
+        char_idx = int(depth_factor * (len(chars)-1))
 
-        if 0 <= sx < width and 0 <= sy < height:
-            # taper ASCII toward edges
-            depth_factor = 1 - t
-            char_idx = int(depth_factor * (len(chars)-1))
-            ch = chars[char_idx]
+        # optional color gradient
+        color = 16 + int(t * 215)
+        cells.append((chars[char_idx], FG_256[color]))
+    return raster, radii, cells
 
-            # optional color gradient
-            color = 16 + int(t * 215)
-            screen[sy][sx] = f"\033[38;5;{color}m{ch}\033[0m"
+def draw_spiral_frame(phase, width, height):
+    raster, radii, cells = spiral_geometry(width, height)
+    screen = [[" "]*width for _ in range(height)]
+    colors = [[""]*width for _ in range(height)]
+    raster.plot(phase, radii, cells, screen, colors, dedupe=True)
+    sampler_stats["frames"] += 1
+    sampler_stats["samples"] += len(radii)
+    sampler_stats["duplicates"] += raster.duplicates
 
-    sys.stdout.write("\033[H")
-    for row in screen:
-        sys.stdout.write("".join(row) + "\n")
-    sys.stdout.flush()
+    return back_buffer.render(screen, colors)
 
-def main():
-    clear_screen()
-    phase = 0.0
-    try:
-        while True:
-            draw_spiral_frame(phase)
-            phase += phase_speed
-            time.sleep(frame_delay)
-    except KeyboardInterrupt:
-        sys.stdout.write("\033[0m\n")
-        sys.exit()
+def main(session=None):
+    session = session or session_from_argv()
+    # a whole number of frames per turn, so frames repeat and can be replayed
+    period = loop_frames(phase_speed, 2 * math.pi)
+    phase_step = math.copysign(2 * math.pi / period, phase_speed)
+    frame_cache = cache_for(session, period)
+    sched = play(session, back_buffer, frame_cache, frame_delay,
+                 lambda index, width, height: draw_spiral_frame(index * phase_step, width, height))
+    if "stats" in session.flags:
+        print(back_buffer.summary())
+        print(sched.summary())
+        print(frame_cache.summary())
+        frames = sampler_stats["frames"] or 1
+        print(f"samples/frame: {sampler_stats['samples'] / frames:.0f}  "
+              f"duplicates/frame: {sampler_stats['duplicates'] / frames:.0f}")
 
 if __name__ == "__main__":
     main()
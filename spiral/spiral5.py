@@ -2,9 +2,17 @@
 # golden_spiral_terminal_animated2.py — full-size circular "golden spiral" in terminal
 
 import math
-import time
-import shutil
 import sys
+import os
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.cycle import play
+from asciifx.encoder import FG_256
+from asciifx.framecache import cache_for, loop_frames
+from asciifx.screen import ScreenBuffer
+from asciifx.session import session_from_argv
+from asciifx.spiral import SpiralRaster
 
 chars = " .:-=+*#%@"
 points_per_turn = 200
@@ -14,53 +22,48 @@ frame_delay = 0.03
 vertical_squash = 0.55
 phi = 1.61803398875
 
-def clear_screen():
-    sys.stdout.write("\033[2J\033[H")
-    sys.stdout.flush()
-
-def draw_spiral_frame(phase):
-    size = shutil.get_terminal_size(fallback=(120,50))
-    width, height = size.columns, size.lines
-    cx, cy = width//2, height//2
-    max_radius = min(cx, int(cy/vertical_squash)) - 1
-
-    screen = [[" "]*width for _ in range(height)]
+back_buffer = ScreenBuffer()  # only changed cells are rewritten each frame
 
+@lru_cache(maxsize=4)
+def spiral_geometry(width, height):
+    # the curve only changes with the terminal size; frames just rotate it
     total_points = turns * points_per_turn
-
+    # Golden spiral angle: slightly accelerated to mimic phi growth
+    raster = SpiralRaster([2 * math.pi * i / points_per_turn * phi for i in range(total_points)],
+                          width, height, vertical_squash)
+    max_radius = raster.max_radius
+    radii, cells = [], []
     for i in range(total_points):
         t = i / total_points  # 0=center, 1=edge
-        # Golden spiral angle: slightly accelerated to mimic phi growth
-        angle = 2 * math.pi * i / points_per_turn * phi + phase
         radius = t * max_radius
+        radii.append(radius)
 
-        x = cx + radius * math.cos(angle)
-        y = cy + radius * math.sin(angle) * vertical_squash
-        sx, sy = int(round(x)), int(round(y))
+        depth_factor = 1 - radius / max_radius
+        char_idx = int(depth_factor * (len(chars)-1))
+        color = 16 + int(depth_factor * 215)
+        cells.append((chars[char_idx], FG_256[color]))
+    return raster, radii, cells
 
-        if 0 <= sx < width and 0 <= sy < height:
-            depth_factor = 1 - radius / max_radius
-            char_idx = int(depth_factor * (len(chars)-1))
-            ch = chars[char_idx]
-            color = 16 + int(depth_factor * 215)
-            screen[sy][sx] = f"\033[38;5;{color}m{ch}\033[0m"
+def draw_spiral_frame(phase, width, height):
+    raster, radii, cells = spiral_geometry(width, height)
+    screen = [[" "]*width for _ in range(height)]
+    colors = [[""]*width for _ in range(height)]
+    raster.plot(phase, radii, cells, screen, colors)
 
-    sys.stdout.write("\033[H")
-    for row in screen:
-        sys.stdout.write("".join(row) + "\n")
-    sys.stdout.flush()
+    return back_buffer.render(screen, colors)
 
-def main():
-    clear_screen()
-    phase = 0.0
-    try:
-        while True:
-            draw_spiral_frame(phase)
-            phase += phase_speed
-            time.sleep(frame_delay)
-    except KeyboardInterrupt:
-        sys.stdout.write("\033[0m\n")
-        sys.exit()
+def main(session=None):
+    session = session or session_from_argv()
+    # a whole number of frames per turn, so frames repeat and can be replayed
+    period = loop_frames(phase_speed, 2 * math.pi)
+    phase_step = math.copysign(2 * math.pi / period, phase_speed)
+    frame_cache = cache_for(session, period)
+    sched = play(session, back_buffer, frame_cache, frame_delay,
+                 lambda index, width, height: draw_spiral_frame(index * phase_step, width, height))
+    if "stats" in session.flags:
+        print(back_buffer.summary())
+        print(sched.summary())
+        print(frame_cache.summary())
 
 if __name__ == "__main__":
     main()
@@ -3,9 +3,17 @@
 # Usage: python3 golden_spiral_outward.py
 
 import math
-import time
-import shutil
 import sys
+import os
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.cycle import play
+from asciifx.encoder import FG_256
+from asciifx.framecache import cache_for, loop_frames
+from asciifx.screen import ScreenBuffer
+from asciifx.session import session_from_argv
+from asciifx.spiral import SpiralRaster
 
 chars = " .:-=+*#%@"
 points_per_turn = 200
@@ -17,57 +25,57 @@ vertical_squash = 0.55
 phi = 1.61803398875
 total_points = turns * points_per_turn
 
-def clear_screen():
-    sys.stdout.write("\033[2J\033[H")
-    sys.stdout.flush()
+back_buffer = ScreenBuffer()  # only changed cells are rewritten each frame
 
-def draw_spiral_frame(phase, expansion_offset):
-    size = shutil.get_terminal_size(fallback=(120,50))
-    width, height = size.columns, size.lines
-    cx, cy = width//2, height//2
-    max_radius = min(cx, int(cy/vertical_squash)) - 1
+@lru_cache(maxsize=4)
+def spiral_geometry(width, height):
+    # sample directions only change with the terminal size; frames rotate
+    # them and recompute the (expanding) radii
+    raster = SpiralRaster([2 * math.pi * i / points_per_turn * phi for i in range(total_points)],
+                          width, height, vertical_squash)
+    return raster, [i / total_points for i in range(total_points)]
 
-    screen = [[" "]*width for _ in range(height)]
+def spiral_cell(radius, max_radius):
+    depth_factor = 1 - (radius / max_radius)
+    char_idx = int(depth_factor * (len(chars)-1))
+    color = 16 + int(depth_factor * 215)
+    return chars[char_idx], FG_256[color]
 
-    for i in range(total_points):
-        t = i / total_points
-        angle = 2 * math.pi * i / points_per_turn * phi + phase
-        # outward motion: expansion_offset moves radius outward each frame
-        radius = t * max_radius + expansion_offset * max_radius
+def draw_spiral_frame(phase, expansion_offset, width, height, prof=None):
+    raster, ts = spiral_geometry(width, height)
+    max_radius = raster.max_radius
+    # outward motion: expansion_offset moves radius outward each frame;
+    # points that exceed max_radius wrap for infinite outward motion
+    radii = [(t * max_radius + expansion_offset * max_radius) % max_radius for t in ts]
+    cells = [spiral_cell(radius, max_radius) for radius in radii]
+    if prof:
+        prof.lap("sim")
 
-        # reset points that exceed max_radius for infinite outward motion
-        radius = radius % max_radius
+    screen = [[" "]*width for _ in range(height)]
+    colors = [[""]*width for _ in range(height)]
+    raster.plot(phase, radii, cells, screen, colors)
 
-        x = cx + radius * math.cos(angle)
-        y = cy + radius * math.sin(angle) * vertical_squash
-        sx, sy = int(round(x)), int(round(y))
+    return back_buffer.render(screen, colors)
 
-        if 0 <= sx < width and 0 <= sy < height:
-            depth_factor = 1 - (radius / max_radius)
-            char_idx = int(depth_factor * (len(chars)-1))
-            ch = chars[char_idx]
-            color = 16 + int(depth_factor * 215)
-            screen[sy][sx] = f"\033[38;5;{color}m{ch}\033[0m"
+def main(session=None):
+    session = session or session_from_argv()
+    # whole numbers of frames per turn and per expansion cycle, so frames
+    # repeat (after lcm of the two) and can be replayed
+    expansion_frames = loop_frames(expansion_speed, 1.0)
+    turn_frames = loop_frames(phase_speed, 2 * math.pi, align=expansion_frames)
+    phase_step = math.copysign(2 * math.pi / turn_frames, phase_speed)
+    frame_cache = cache_for(session, math.lcm(turn_frames, expansion_frames))
 
-    sys.stdout.write("\033[H")
-    for row in screen:
-        sys.stdout.write("".join(row) + "\n")
-    sys.stdout.flush()
+    def draw(index, width, height):
+        phase = (index % turn_frames) * phase_step
+        expansion_offset = (index % expansion_frames) / expansion_frames
+        return draw_spiral_frame(phase, expansion_offset, width, height, session.profiler)
 
-def main():
-    clear_screen()
-    phase = 0.0
-    expansion_offset = 0.0
-    try:
-        while True:
-            draw_spiral_frame(phase, expansion_offset)
-            phase += phase_speed
-            expansion_offset += expansion_speed
-            expansion_offset %= 1.0
-            time.sleep(frame_delay)
-    except KeyboardInterrupt:
-        sys.stdout.write("\033[0m\n")
-        sys.exit()
+    sched = play(session, back_buffer, frame_cache, frame_delay, draw)
+    if "stats" in session.flags:
+        print(back_buffer.summary())
+        print(sched.summary())
+        print(frame_cache.summary())
 
 if __name__ == "__main__":
     main()
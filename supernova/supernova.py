@@ -1,9 +1,18 @@
 import os
 import sys
-import time
 import random
 import math
-import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.rng import BatchRandom
+from asciifx.session import session_from_argv
+from asciifx.simloop import SimLoop
+
+try:
+    import numpy as np
+    from asciifx.particles import ParticleField, grids_to_rows
+except ImportError:  # optional: without numpy the Particle objects below are used
+    np = None
 
 # ANSI colors for supernova layers
 colors = [
@@ -14,8 +23,9 @@ colors = [
     '\033[95m',  # Magenta
 ]
 
-RESET = '\033[0m'
+MAX_PARTICLES = 50000  # hard cap for the columnar engine
 symbols = ['*', '+', '.', 'o', '@', '%', '#']
+rng = BatchRandom()  # per-frame draws for the Particle objects
 
 class Particle:
     def __init__(self, x, y, vx, vy, color, lifetime):
@@ -26,10 +36,10 @@ class Particle:
         self.color = color
         self.lifetime = lifetime
 
-    def update(self):
-        # Update position with some turbulence
-        self.x += self.vx + random.uniform(-0.05, 0.05)
-        self.y += self.vy + random.uniform(-0.05, 0.05)
+    def update(self, jx, jy):
+        # Update position with some turbulence (jx, jy)
+        self.x += self.vx + jx
+        self.y += self.vy + jy
         self.lifetime -= 1
 
 def clear_screen():
@@ -47,54 +57,81 @@ def generate_particles(center_x, center_y, num_particles):
         particles.append(Particle(center_x, center_y, vx, vy, color, lifetime))
     return particles
 
-def draw_frame(particles, width, height):
+def draw_frame(particles, width, height, behind=0.0):
     grid = [[' ' for _ in range(width)] for _ in range(height)]
     color_grid = [['' for _ in range(width)] for _ in range(height)]
-    for p in particles:
-        x, y = int(p.x), int(p.y)
+    # a fresh random symbol per particle per frame, drawn in one batch
+    for p, symbol in zip(particles, rng.choice(symbols, len(particles))):
+        x, y = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
         if 0 <= x < width and 0 <= y < height:
-            grid[y][x] = random.choice(symbols)
+            grid[y][x] = symbol
             color_grid[y][x] = p.color
-    lines = []
-    for y in range(height):
-        line = ''
-        for x in range(width):
-            if grid[y][x] != ' ':
-                line += f"{color_grid[y][x]}{grid[y][x]}{RESET}"
-            else:
-                line += ' '
-        lines.append(line)
-    return '\n'.join(lines)
-
-def supernova_simulation():
-    # Terminal size
-    size = shutil.get_terminal_size()
-    width, height = size.columns, size.lines
-    center_x, center_y = width // 2, height // 2
+    return grid, color_grid
 
-    # Initial particles
-    particles = generate_particles(center_x, center_y, 1500)  # Much denser
+# The simulation runs on the columnar engine when numpy is available and on
+# the Particle objects above otherwise; these wrap the difference.
+def new_particles(center_x, center_y, num_particles):
+    if np is None:
+        return generate_particles(center_x, center_y, num_particles)
+    field = ParticleField(jitter="position", turbulence=0.05, max_particles=MAX_PARTICLES)
+    add_particles(field, center_x, center_y, num_particles)
+    return field
 
-    try:
-        while particles:
-            clear_screen()
-            print(draw_frame(particles, width, height))
-            time.sleep(0.03)  # Slightly faster for smoother motion
+def add_particles(particles, center_x, center_y, num_particles):
+    if np is None:
+        particles.extend(generate_particles(center_x, center_y, num_particles))
+        return
+    rng = particles.rng
+    particles.burst(center_x, center_y, rng.uniform(0.05, 1.5, num_particles),
+                    rng.integers(0, len(colors), num_particles), 0,
+                    rng.integers(50, 301, num_particles))
 
-            # Update particles
-            for p in particles:
-                p.update()
+def step_particles(particles):
+    if np is None:
+        # the turbulence of a whole step in two draws (asciifx.rng)
+        jx = rng.uniform(-0.05, 0.05, len(particles))
+        jy = rng.uniform(-0.05, 0.05, len(particles))
+        for p, dx, dy in zip(particles, jx, jy):
+            p.update(dx, dy)
+        return [p for p in particles if p.lifetime > 0]
+    particles.update()
+    particles.cull()
+    return particles
 
-            # Remove dead particles
-            particles = [p for p in particles if p.lifetime > 0]
+def render_frame(particles, width, height, behind=0.0):
+    if np is None:
+        return draw_frame(particles, width, height, behind)
+    # a fresh random symbol per particle per frame, like draw_frame
+    symbol = particles.rng.integers(0, len(symbols), len(particles))
+    sym_grid, col_grid = particles.raster(width, height, symbol, behind)
+    return grids_to_rows(sym_grid, col_grid, symbols, colors)
 
-            # Continuously spawn a few new particles for ongoing explosion
-            if random.random() < 0.2:
-                particles.extend(generate_particles(center_x, center_y, random.randint(10, 30)))
+def supernova_simulation(session=None):
+    session = session or session_from_argv()
+    loop = SimLoop(session, 0.03, MAX_PARTICLES)
 
+    # Initial particles
+    particles = new_particles(loop.width // 2, loop.height // 2, 1500)  # Much denser
+
+    def step(loop):
+        nonlocal particles
+        # Update particles and remove dead ones
+        particles = step_particles(particles)
+
+        # Continuously spawn a few new particles for ongoing explosion
+        if len(particles) < loop.cap and random.random() < 0.2 * loop.spawn:
+            add_particles(particles, loop.width // 2, loop.height // 2, random.randint(10, 30))
+
+    def render(loop, behind):
+        loop.show(render_frame(particles, loop.width, loop.height, behind), "\033[H\033[2J")
+
+    try:
+        with session:
+            loop.run(step, render, until=lambda: not particles)
     except KeyboardInterrupt:
         clear_screen()
-        sys.exit()
+    if "stats" in session.flags:
+        print(loop.summary())
 
 if __name__ == "__main__":
     supernova_simulation()
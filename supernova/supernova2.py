@@ -1,9 +1,19 @@
 import os
 import sys
-import time
 import random
 import math
-import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.rng import BatchRandom
+from asciifx.session import session_from_argv
+from asciifx.simloop import SimLoop
+from asciifx.writer import write_control
+
+try:
+    import numpy as np
+    from asciifx.particles import ParticleField, grids_to_rows
+except ImportError:  # optional: without numpy the Particle objects below are used
+    np = None
 
 # Bright ANSI colors for plasma
 colors = [
@@ -15,10 +25,11 @@ colors = [
     '\033[96m',  # Cyan
 ]
 
-RESET = '\033[0m'
+MAX_PARTICLES = 50000  # hard cap for the columnar engine
 
 # Symbols for different particle types
 symbols = ['*', '+', '.', 'o', '@', '%', '#', '&']
+rng = BatchRandom()  # per-frame draws for the Particle objects
 
 class Particle:
     def __init__(self, x, y, vx, vy, color, lifetime, symbol):
@@ -30,10 +41,10 @@ class Particle:
         self.lifetime = lifetime
         self.symbol = symbol
 
-    def update(self):
-        # Add turbulence to velocity
-        self.vx += random.uniform(-0.05, 0.05)
-        self.vy += random.uniform(-0.05, 0.05)
+    def update(self, jx, jy):
+        # Add turbulence (jx, jy) to velocity
+        self.vx += jx
+        self.vy += jy
         self.x += self.vx
         self.y += self.vy
         self.lifetime -= 1
@@ -56,61 +67,95 @@ def generate_particles(center_x, center_y, num_particles, dense=True):
         particles.append(Particle(center_x, center_y, vx, vy, color, lifetime, symbol))
     return particles
 
-def draw_frame(particles, width, height):
+def draw_frame(particles, width, height, behind=0.0):
     grid = [[' ' for _ in range(width)] for _ in range(height)]
     color_grid = [['' for _ in range(width)] for _ in range(height)]
     for p in particles:
-        x, y = int(p.x), int(p.y)
+        x, y = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
         if 0 <= x < width and 0 <= y < height:
             grid[y][x] = p.symbol
             color_grid[y][x] = p.color
-    lines = []
-    for y in range(height):
-        line = ''
-        for x in range(width):
-            if grid[y][x] != ' ':
-                line += f"{color_grid[y][x]}{grid[y][x]}{RESET}"
-            else:
-                # Random dark globules for supernova remnants
-                if random.random() < 0.02:
-                    line += '.'
-                else:
-                    line += ' '
-        lines.append(line)
-    return '\n'.join(lines)
-
-def supernova_simulation():
-    size = shutil.get_terminal_size()
-    width, height = size.columns, size.lines
-    center_x, center_y = width // 2, height // 2
+    # Random dark globules for supernova remnants (default color): the
+    # blank cells among those a 2% draw per cell hits
+    for i in rng.sparse(width * height, 0.02):
+        row = grid[i // width]
+        if row[i % width] == ' ':
+            row[i % width] = '.'
+    return grid, color_grid
+
+# The simulation runs on the columnar engine when numpy is available and on
+# the Particle objects above otherwise; these wrap the difference.
+def new_particles(center_x, center_y, num_particles):
+    if np is None:
+        return generate_particles(center_x, center_y, num_particles)
+    field = ParticleField(jitter="velocity", turbulence=0.05, max_particles=MAX_PARTICLES)
+    add_particles(field, center_x, center_y, num_particles)
+    return field
+
+def add_particles(particles, center_x, center_y, num_particles, dense=True):
+    if np is None:
+        particles.extend(generate_particles(center_x, center_y, num_particles, dense))
+        return
+    rng = particles.rng
+    r = rng.uniform(0, 1 if dense else 5, num_particles)
+    particles.burst(center_x, center_y, r * rng.uniform(0.2, 2.0, num_particles),
+                    rng.integers(0, len(colors), num_particles),
+                    rng.integers(0, len(symbols), num_particles),
+                    rng.integers(50, 501, num_particles))
+
+def step_particles(particles):
+    if np is None:
+        # the turbulence of a whole step in two draws (asciifx.rng)
+        jx = rng.uniform(-0.05, 0.05, len(particles))
+        jy = rng.uniform(-0.05, 0.05, len(particles))
+        for p, dx, dy in zip(particles, jx, jy):
+            p.update(dx, dy)
+        return [p for p in particles if p.lifetime > 0]
+    particles.update()
+    particles.cull()
+    return particles
 
-    # Initial dense cloud
-    particles = generate_particles(center_x, center_y, 5000)
+def render_frame(particles, width, height, behind=0.0):
+    if np is None:
+        return draw_frame(particles, width, height, behind)
+    sym_grid, col_grid = particles.raster(width, height, behind=behind)
+    # Random dark globules for supernova remnants (default color)
+    dots = (sym_grid < 0) & (particles.rng.random(sym_grid.shape) < 0.02)
+    sym_grid[dots] = symbols.index('.')
+    return grids_to_rows(sym_grid, col_grid, symbols, colors)
 
-    try:
-        while True:
-            print("/033[H", end='') # Move cursor to top-left
-            print(draw_frame(particles, width, height))
-            time.sleep(0.03)
+def supernova_simulation(session=None):
+    session = session or session_from_argv()
+    loop = SimLoop(session, 0.03, MAX_PARTICLES)
+    center_x, center_y = loop.width // 2, loop.height // 2
+
+    # Initial dense cloud
+    particles = new_particles(center_x, center_y, 5000)
 
-            # Update all particles
-            for p in particles:
-                p.update()
+    def step(loop):
+        nonlocal particles
+        center_x, center_y = loop.width // 2, loop.height // 2
+        # Update all particles and remove dead ones
+        particles = step_particles(particles)
 
-            # Remove dead particles
-            particles = [p for p in particles if p.lifetime > 0]
+        # Continuously spawn new particles for psychedelic chaos
+        if len(particles) < loop.cap and random.random() < 0.5 * loop.spawn:
+            add_particles(particles, center_x, center_y, random.randint(50, 200))
 
-            # Continuously spawn new particles for psychedelic chaos
-            if random.random() < 0.5:
-                particles.extend(generate_particles(center_x, center_y, random.randint(50, 200)))
+        # Slightly increase center turbulence for dark globules
+        if random.random() < 0.05:
+            add_particles(particles, center_x, center_y, random.randint(5, 20), dense=False)
 
-            # Slightly increase center turbulence for dark globules
-            if random.random() < 0.05:
-                particles.extend(generate_particles(center_x, center_y, random.randint(5, 20), dense=False))
+    def render(loop, behind):
+        loop.show(render_frame(particles, loop.width, loop.height, behind), "\033[H")  # Move cursor to top-left
 
+    try:
+        with session:
+            loop.run(step, render, resized=lambda loop: write_control("\033[2J"))
     except KeyboardInterrupt:
         clear_screen()
-        sys.exit()
+    if "stats" in session.flags:
+        print(loop.summary())
 
 if __name__ == "__main__":
     supernova_simulation()
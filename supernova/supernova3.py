@@ -1,9 +1,19 @@
 import os
 import sys
-import time
 import random
 import math
-import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.rng import BatchRandom
+from asciifx.session import session_from_argv
+from asciifx.simloop import SimLoop
+from asciifx.writer import write_control
+
+try:
+    import numpy as np
+    from asciifx.particles import GLOBULE, SPIRAL, ParticleField, grids_to_rows
+except ImportError:  # optional: without numpy the Particle objects below are used
+    np = None
 
 # Bright ANSI colors for plasma
 colors = [
@@ -15,8 +25,9 @@ colors = [
     '\033[96m',  # Cyan
 ]
 
-RESET = '\033[0m'
+MAX_PARTICLES = 50000  # hard cap for the columnar engine
 symbols = ['*', '+', '.', 'o', '@', '%', '#', '&']
+rng = BatchRandom()  # per-frame draws for the Particle objects
 
 class Particle:
     def __init__(self, x, y, vx, vy, color, lifetime, symbol, is_globule=False, is_spiral=False):
@@ -30,10 +41,10 @@ class Particle:
         self.is_globule = is_globule
         self.is_spiral = is_spiral
 
-    def update(self):
+    def update(self, jx, jy):
         # Chaos turbulence
-        self.vx += random.uniform(-0.03, 0.03)
-        self.vy += random.uniform(-0.03, 0.03)
+        self.vx += jx
+        self.vy += jy
 
         if self.is_spiral:
             cx, cy = self.center
@@ -79,74 +90,122 @@ def generate_particles(center_x, center_y, num_particles, dense=True, globule=Fa
         particles.append(p)
     return particles
 
-def draw_frame(particles, width, height):
+def draw_frame(particles, width, height, behind=0.0):
     grid = [[' ' for _ in range(width)] for _ in range(height)]
     color_grid = [['' for _ in range(width)] for _ in range(height)]
 
     for p in particles:
-        x, y = int(p.x), int(p.y)
+        x, y = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
         if 0 <= x < width and 0 <= y < height:
             grid[y][x] = p.symbol
             color_grid[y][x] = p.color
 
-    # Globules cluster effect
-    for p in [pt for pt in particles if pt.is_globule]:
-        gx, gy = int(p.x), int(p.y)
-        for dx in range(-2, 3):
-            for dy in range(-2, 3):
-                nx, ny = gx + dx, gy + dy
-                if 0 <= nx < width and 0 <= ny < height:
-                    if random.random() < 0.5:
-                        grid[ny][nx] = ' '
-                        color_grid[ny][nx] = '\033[90m'
-
-    lines = []
-    for y in range(height):
-        line = ''
-        for x in range(width):
-            if grid[y][x] != ' ':
-                line += f"{color_grid[y][x]}{grid[y][x]}{RESET}"
-            else:
-                line += ' '
-        lines.append(line)
-    return '\n'.join(lines)
-
-def supernova_simulation():
-    size = shutil.get_terminal_size()
-    width, height = size.columns, size.lines
-    center_x, center_y = width // 2, height // 2
-
-    particles = generate_particles(center_x, center_y, 5000)
+    # Globules cluster effect: one coin per cell of each 5x5 area, drawn at once
+    globules = [pt for pt in particles if pt.is_globule]
+    coins = iter(rng.random(len(globules) * len(GLOBULE_OFFSETS)))
+    for p in globules:
+        gx, gy = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
+        for dx, dy in GLOBULE_OFFSETS:
+            nx, ny = gx + dx, gy + dy
+            if next(coins) < 0.5 and 0 <= nx < width and 0 <= ny < height:
+                grid[ny][nx] = ' '
+                color_grid[ny][nx] = '\033[90m'
+
+    return grid, color_grid
+
+# The simulation runs on the columnar engine when numpy is available and on
+# the Particle objects above otherwise; these wrap the difference.
+def new_particles(center_x, center_y, num_particles):
+    if np is None:
+        return generate_particles(center_x, center_y, num_particles)
+    field = ParticleField(jitter="velocity", turbulence=0.03, max_particles=MAX_PARTICLES)
+    add_particles(field, center_x, center_y, num_particles)
+    return field
+
+def add_particles(particles, center_x, center_y, num_particles, dense=True, globule=False, spiral=False):
+    if np is None:
+        particles.extend(generate_particles(center_x, center_y, num_particles, dense, globule, spiral))
+        return
+    rng = particles.rng
+    r = rng.uniform(0, 1 if dense else 5, num_particles)
+    speed = r * rng.uniform(0.2, 2.0, num_particles)
+    life = rng.integers(50, 501, num_particles)
+    flags = SPIRAL if spiral else 0
+    if globule:
+        # invisible, dark: they only matter for the cluster effect
+        particles.burst(center_x, center_y, speed, -1, -1, life, flags | GLOBULE)
+    else:
+        particles.burst(center_x, center_y, speed, rng.integers(0, len(colors), num_particles),
+                        rng.integers(0, len(symbols), num_particles), life, flags)
+
+def step_particles(particles):
+    if np is None:
+        # the turbulence of a whole step in two draws (asciifx.rng)
+        jx = rng.uniform(-0.03, 0.03, len(particles))
+        jy = rng.uniform(-0.03, 0.03, len(particles))
+        for p, dx, dy in zip(particles, jx, jy):
+            p.update(dx, dy)
+        return [p for p in particles if p.lifetime > 0]
+    particles.update()
+    particles.cull()
+    return particles
+
+GLOBULE_OFFSETS = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3)]
+
+def render_frame(particles, width, height, behind=0.0):
+    if np is None:
+        return draw_frame(particles, width, height, behind)
+    sym_grid, col_grid = particles.raster(width, height, behind=behind)
+
+    # Globules cluster effect: each clears about half of its 5x5 area
+    gx, gy = particles.globules(behind)
+    if len(gx):
+        off = np.array(GLOBULE_OFFSETS)
+        nx = gx[:, None] + off[:, 0]
+        ny = gy[:, None] + off[:, 1]
+        hit = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height) & \
+            (particles.rng.random(nx.shape) < 0.5)
+        sym_grid[ny[hit], nx[hit]] = -1
+
+    return grids_to_rows(sym_grid, col_grid, symbols, colors)
+
+def supernova_simulation(session=None):
+    session = session or session_from_argv()
+    loop = SimLoop(session, 0.03, MAX_PARTICLES)
+    center_x, center_y = loop.width // 2, loop.height // 2
+
+    particles = new_particles(center_x, center_y, 5000)
 
     # Initial globules
     for _ in range(5):
-        particles.extend(generate_particles(center_x, center_y, random.randint(30, 80), globule=True))
+        add_particles(particles, center_x, center_y, random.randint(30, 80), globule=True)
 
     # Stronger spiral thread
-    particles.extend(generate_particles(center_x, center_y, 600, spiral=True))  # increased count
+    add_particles(particles, center_x, center_y, 600, spiral=True)  # increased count
 
-    try:
-        while True:
-            print("\033[H", end='')
-            print(draw_frame(particles, width, height))
-            time.sleep(0.03)
-
-            for p in particles:
-                p.update()
+    def step(loop):
+        nonlocal particles
+        center_x, center_y = loop.width // 2, loop.height // 2
+        particles = step_particles(particles)
 
-            particles = [p for p in particles if p.lifetime > 0]
+        # Chaos spawning
+        if len(particles) < loop.cap and random.random() < 0.5 * loop.spawn:
+            add_particles(particles, center_x, center_y, random.randint(50, 200))
+        if random.random() < 0.1:
+            add_particles(particles, center_x, center_y, random.randint(10, 30), globule=True)
+        if random.random() < 0.05:
+            add_particles(particles, center_x, center_y, random.randint(10, 30), spiral=True)
 
-            # Chaos spawning
-            if random.random() < 0.5:
-                particles.extend(generate_particles(center_x, center_y, random.randint(50, 200)))
-            if random.random() < 0.1:
-                particles.extend(generate_particles(center_x, center_y, random.randint(10, 30), globule=True))
-            if random.random() < 0.05:
-                particles.extend(generate_particles(center_x, center_y, random.randint(10, 30), spiral=True))
+    def render(loop, behind):
+        loop.show(render_frame(particles, loop.width, loop.height, behind), "\033[H")
 
+    try:
+        with session:
+            loop.run(step, render, resized=lambda loop: write_control("\033[2J"))
     except KeyboardInterrupt:
         clear_screen()
-        sys.exit()
+    if "stats" in session.flags:
+        print(loop.summary())
 
 if __name__ == "__main__":
     supernova_simulation()
@@ -1,11 +1,33 @@
 import curses
+import os
 import random
 import math
-import time
+import sys
 
-# Particle class
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asciifx.cursesscreen import CursesScreen
+from asciifx.encoder import encode_frame
+from asciifx.keys import CursesKeys
+from asciifx.pool import ParticlePool
+from asciifx.rng import BatchRandom
+from asciifx.session import session_from_argv
+from asciifx.simloop import SimLoop
+
+MAX_PARTICLES = 15000  # hard cap; spawns beyond it are rejected
+rng = BatchRandom()  # per-step turbulence for all particles at once
+
+# SGR for each color pair as galaxy_simulation sets them up (pair i+1 is
+# color i), used to render headless frames without curses
+PAIR_SGR = [""] + [f"\033[{30 + i}m" for i in range(8)]
+
+# Particle class (pooled: slots are recycled through reset)
 class Particle:
-    def __init__(self, x, y, vx, vy, symbol, color, lifetime, kind='disk'):
+    __slots__ = ('x', 'y', 'vx', 'vy', 'symbol', 'color', 'lifetime', 'kind')
+
+    def __init__(self, x=0.0, y=0.0, vx=0.0, vy=0.0, symbol=' ', color=0, lifetime=0, kind='disk'):
+        self.reset(x, y, vx, vy, symbol, color, lifetime, kind)
+
+    def reset(self, x, y, vx, vy, symbol, color, lifetime, kind='disk'):
         self.x = x
         self.y = y
         self.vx = vx
@@ -15,14 +37,14 @@ class Particle:
         self.lifetime = lifetime
         self.kind = kind  # 'disk', 'globule', 'supernova'
 
-    def update(self, cx, cy, center_radius, spiral_strength, turbulence):
+    def update(self, cx, cy, center_radius, spiral_strength, jx, jy):
         dx = self.x - cx
         dy = self.y - cy
         r = math.hypot(dx, dy) + 0.0001
 
-        # Chaos turbulence
-        self.vx += random.uniform(-turbulence, turbulence)
-        self.vy += random.uniform(-turbulence, turbulence)
+        # Chaos turbulence (jx, jy)
+        self.vx += jx
+        self.vy += jy
 
         # Gravity toward center (black hole)
         g_strength = 0.002 if self.kind != 'disk' else 0.0
@@ -41,9 +63,8 @@ class Particle:
         self.y += self.vy
         self.lifetime -= 1
 
-# Generate particles
-def generate_particles(cx, cy, num, kind='supernova'):
-    particles = []
+# Generate particles into the pool
+def generate_particles(pool, cx, cy, num, kind='supernova'):
     colors = {
         'disk': [curses.COLOR_YELLOW, curses.COLOR_MAGENTA, curses.COLOR_WHITE, curses.COLOR_CYAN],
         'globule': [curses.COLOR_BLACK],
@@ -55,7 +76,7 @@ def generate_particles(cx, cy, num, kind='supernova'):
         'globule': [' '],
         'supernova': ['*', '+', '.', 'o', '@', '%', '#', '&']
     }
-    for _ in range(num):
+    for i in range(num):
         # Random offset from center for implosion + chaotic supernova
         r0 = random.uniform(0.5, 8)  # wider initial cloud
         angle0 = random.uniform(0, 2*math.pi)
@@ -70,80 +91,135 @@ def generate_particles(cx, cy, num, kind='supernova'):
         symbol = random.choice(symbols[kind])
         color = random.choice(colors[kind])
         lifetime = random.randint(1000, 4000)
-        particles.append(Particle(x, y, vx, vy, symbol, color, lifetime, kind))
-    return particles
+        if pool.spawn(x, y, vx, vy, symbol, color, lifetime, kind) is None:
+            pool.rejections += num - i - 1  # pool is full: the rest are refused too
+            break
 
-# Draw frame
-def draw_frame(stdscr, particles, width, height):
+# Rasterize particles into glyph / color pair grids; behind > 0 draws them
+# that many steps back (--interpolate)
+def build_grids(particles, width, height, behind=0.0):
     grid = [[' ' for _ in range(width)] for _ in range(height)]
     color_grid = [[0 for _ in range(width)] for _ in range(height)]
     for p in particles:
-        x, y = int(p.x), int(p.y)
+        x, y = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
         if 0 <= x < width and 0 <= y < height:
             grid[y][x] = p.symbol
             color_grid[y][x] = p.color
-    for y in range(height):
-        for x in range(width):
-            try:
-                stdscr.addch(y, x, grid[y][x], curses.color_pair(color_grid[y][x]))
-            except curses.error:
-                pass
-
-# Main simulation
-def galaxy_simulation(stdscr):
-    curses.curs_set(0)
-    curses.start_color()
-    curses.use_default_colors()
-    for i in range(0, curses.COLORS):
-        curses.init_pair(i+1, i, -1)
-
-    height, width = stdscr.getmaxyx()
-    cx, cy = width // 2, height // 2
+    return grid, color_grid
+
+# Occupied cells for CursesScreen: y * width + x -> (symbol, color pair)
+def occupied_cells(particles, width, height, behind=0.0):
+    cells = {}
+    for p in particles:
+        x, y = int(p.x - p.vx * behind), int(p.y - p.vy * behind)
+        if 0 <= x < width and 0 <= y < height:
+            cells[y * width + x] = (p.symbol, p.color)
+    return cells
+
+# Headless frame: the same grids as ANSI text
+def encode_grids(grid, color_grid):
+    return "\033[H" + encode_frame(grid, [[PAIR_SGR[c] for c in row] for row in color_grid])
+
+# Main simulation; stdscr is None when running headless
+def galaxy_simulation(stdscr, pool, session, loop, screen=None):
+    prof = session.profiler
+    if stdscr is not None:
+        curses.curs_set(0)
+        curses.start_color()
+        curses.use_default_colors()
+        for i in range(0, curses.COLORS):
+            curses.init_pair(i+1, i, -1)
+        # curses reads the keyboard and the size itself
+        loop.keys = CursesKeys(stdscr)
+        loop.size = lambda: stdscr.getmaxyx()[::-1]
+        loop.resize()
+    cx, cy = loop.width // 2, loop.height // 2
     center_radius = 3
 
     # Immediate imploding star + dense supernova
-    particles = generate_particles(cx, cy, 6000, 'supernova')   # dense supernova
-    particles.extend(generate_particles(cx, cy, 500, 'disk'))    # disk/spiral seeds
-    particles.extend(generate_particles(cx, cy, 200, 'globule')) # dark remnants
+    generate_particles(pool, cx, cy, 6000, 'supernova')   # dense supernova
+    generate_particles(pool, cx, cy, 500, 'disk')         # disk/spiral seeds
+    generate_particles(pool, cx, cy, 200, 'globule')      # dark remnants
 
-    start_time = time.time()
     duration = 30*60  # ~30 minutes real-time evolution
-    spiral_strength = 0.05
-    turbulence = 0.05
 
-    while True:
-        stdscr.erase()
-        height, width = stdscr.getmaxyx()
-        cx, cy = width // 2, height // 2
-
-        elapsed = time.time() - start_time
+    def step(loop):
+        cx, cy = loop.width // 2, loop.height // 2
+        elapsed = loop.clock.steps * loop.clock.dt
         # Strengthen spiral and reduce turbulence over time
         spiral_strength = min(0.15, 0.05 + 0.1*(elapsed/duration))
         turbulence = max(0.01, 0.05 - 0.04*(elapsed/duration))
 
-        for p in particles:
-            p.update(cx, cy, center_radius, spiral_strength, turbulence)
+        jx = rng.uniform(-turbulence, turbulence, len(pool))
+        jy = rng.uniform(-turbulence, turbulence, len(pool))
+        for p, dx, dy in zip(pool, jx, jy):
+            p.update(cx, cy, center_radius, spiral_strength, dx, dy)
 
-        # Absorb particles into central black hole
-        new_particles = []
-        for p in particles:
-            if p.kind != 'globule' and math.hypot(p.x-cx, p.y-cy) < center_radius:
-                continue
-            if p.lifetime > 0:
-                new_particles.append(p)
-        particles = new_particles
+        # Absorb particles into central black hole, recycle dead ones
+        pool.retain(lambda p: p.lifetime > 0 and
+                    (p.kind == 'globule' or math.hypot(p.x-cx, p.y-cy) >= center_radius))
 
         # Spawn additional particles for chaotic effect
-        if random.random() < 0.3:
-            particles.extend(generate_particles(cx, cy, random.randint(20, 50), 'supernova'))
+        if len(pool) < loop.cap and random.random() < 0.3 * loop.spawn:
+            generate_particles(pool, cx, cy, random.randint(20, 50), 'supernova')
         if random.random() < 0.02:
-            particles.extend(generate_particles(cx, cy, random.randint(5, 15), 'disk'))
+            generate_particles(pool, cx, cy, random.randint(5, 15), 'disk')
         if random.random() < 0.02:
-            particles.extend(generate_particles(cx, cy, random.randint(2, 5), 'globule'))
-
-        draw_frame(stdscr, particles, width, height)
-        stdscr.refresh()
-        time.sleep(0.03)
+            generate_particles(pool, cx, cy, random.randint(2, 5), 'globule')
+
+    def render_curses(loop, behind):
+        # only vacated and changed cells reach curses (asciifx.cursesscreen)
+        width, height = loop.width, loop.height
+        cells = occupied_cells(pool, width, height, behind)
+        if prof:
+            prof.lap("raster")
+        screen.draw(stdscr, cells, width, height)
+        if prof:
+            prof.lap("encode")
+            if prof.hud:
+                try:
+                    stdscr.addstr(0, 0, prof.hud_line(width - 1), curses.A_REVERSE)
+                except curses.error:
+                    pass
+        screen.refresh(stdscr)
+        if prof:
+            prof.lap("write")
+            prof.end_frame()
+
+    def render_text(loop, behind):
+        grid, color_grid = build_grids(pool, loop.width, loop.height, behind)
+        if prof:
+            prof.lap("raster")
+        text = encode_grids(grid, color_grid)
+        if prof:
+            prof.lap("encode")
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        if prof:
+            prof.lap("write")
+            prof.end_frame(loop.width)
+
+    loop.run(step, render_curses if stdscr is not None else render_text)
+
+def main(session=None):
+    session = session or session_from_argv()
+    max_particles = int(session.options.get("max-particles", MAX_PARTICLES))
+    pool = ParticlePool(Particle, max_particles)
+    loop = SimLoop(session, 0.03, pool.capacity)
+    screen = CursesScreen("full-redraw" in session.flags, "stats" in session.flags)
+    try:
+        with session:
+            if session.headless:
+                galaxy_simulation(None, pool, session, loop)
+            else:
+                curses.wrapper(galaxy_simulation, pool, session, loop, screen)
+    except KeyboardInterrupt:
+        pass
+    if "stats" in session.flags:
+        print(pool.summary())
+        print(loop.summary())
+        if screen.frames:
+            print(screen.summary())
 
 if __name__ == "__main__":
-    curses.wrapper(galaxy_simulation)
+    main()
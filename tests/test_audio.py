@@ -0,0 +1,72 @@
+import array
+import math
+import sys
+import wave
+
+import pytest
+
+from asciifx.audio import AudioInput, write_fixture
+
+pytest.importorskip("numpy")  # the band split needs the FFT; without numpy all bands are RMS
+
+RATE = 44100
+FPS = 30
+
+
+def write_tone(path, freq, seconds=1.0, amplitude=0.5):
+    samples = array.array("h", (int(amplitude * 32767 * math.sin(2 * math.pi * freq * i / RATE))
+                                for i in range(int(seconds * RATE))))
+    if sys.byteorder == "big":
+        samples.byteswap()
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(samples.tobytes())
+    return str(path)
+
+
+def levels(path, until):
+    # the levels per frame, as a loop at FPS would see them
+    audio = AudioInput(path)
+    frames = []
+    for n in range(int(until * FPS) + 1):
+        audio.update(n / FPS)
+        frames.append((n / FPS, audio.bass, audio.mid, audio.treble, audio.level))
+    audio.close()
+    return frames
+
+
+def test_low_tone_raises_bass_only(tmp_path):
+    _, bass, mid, treble, level = levels(write_tone(tmp_path / "low.wav", 60), 0.8)[-1]
+    assert bass > 0.8
+    assert treble < 0.2
+    assert level > 0.8
+
+
+def test_high_tone_raises_treble_only(tmp_path):
+    _, bass, mid, treble, level = levels(write_tone(tmp_path / "high.wav", 6000), 0.8)[-1]
+    assert treble > 0.8
+    assert bass < 0.2
+
+
+def test_silence_stays_low(tmp_path):
+    _, bass, mid, treble, level = levels(write_tone(tmp_path / "quiet.wav", 60, amplitude=0.0), 0.5)[-1]
+    assert max(bass, mid, treble, level) < 0.05
+
+
+def test_fixture_kicks_raise_bass_on_the_beat(tmp_path):
+    path = str(tmp_path / "beats.wav")
+    write_fixture(path, seconds=2.0)
+    bass = [b for _, b, _, _, _ in levels(path, 1.95)]
+    # a kick every 0.5 s: the bass is up just after one and down before the next
+    for beat in (1.0, 1.5):
+        on = bass[int((beat + 0.05) * FPS)]
+        off = bass[int((beat + 0.45) * FPS)]
+        assert on > 0.6
+        assert on > off + 0.3
+
+
+def test_past_the_end_is_silence(tmp_path):
+    frames = levels(write_tone(tmp_path / "short.wav", 60, seconds=0.3), 2.0)
+    assert frames[-1][4] < 0.05
@@ -0,0 +1,61 @@
+import re
+
+import pytest
+
+import inferno
+import tiedye
+from asciifx.bands import BandPool, split_rows
+from asciifx.encoder import encode_frame
+
+TOKEN = re.compile(r"\033\[[0-9;]*m|.", re.S)
+SIZES = [(60, 20), (150, 45)]
+WORKERS = [1, 3, 4]
+TIMES = [0.0, 2.5]
+
+
+def screen(text):
+    # what a terminal shows for a frame: rows of (glyph, color) cells
+    rows, row, color = [], [], ""
+    for token in TOKEN.findall(text):
+        if token == "\n":
+            rows.append(row)
+            row = []
+        elif token.startswith("\033"):
+            color = "" if token in ("\033[0m", "\033[39m") else token
+        else:
+            row.append((token, color if token != " " else ""))
+    rows.append(row)
+    return rows
+
+
+def test_split_rows_covers_the_frame():
+    for height in (1, 7, 45):
+        for bands in (1, 3, 4, 60):
+            spans = split_rows(height, bands)
+            assert spans[0][0] == 0 and spans[-1][1] == height
+            assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+            assert max(y1 - y0 for y0, y1 in spans) - min(y1 - y0 for y0, y1 in spans) <= 1
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("size", SIZES)
+def test_tiedye_bands_show_the_single_process_frame(size, workers):
+    scaled = tiedye.scale_art_to_terminal(*size)
+    params = (0.07, 1.3, 0.25, 3, "truecolor")
+    with BandPool(tiedye.render_band, workers) as pool:
+        pool.setup(scaled, len(scaled[0]), len(scaled))
+        for t in TIMES:
+            whole = encode_frame(*tiedye.render_rows(scaled, t, *params))
+            assert screen("\n".join(pool.render((t, params)))) == screen(whole)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("size", SIZES)
+def test_inferno_bands_show_the_single_process_frame(size, workers):
+    base = inferno.scale_art_to_terminal(*size)
+    params = (0.06, 1.2, 0.25)
+    with BandPool(inferno.render_band, workers) as pool:
+        pool.setup((base, False, "loop"), len(base[0]), len(base))
+        for t in TIMES:
+            whole = encode_frame(*inferno.render_rows_loop(base, t, False, *params))
+            assert screen("\n".join(pool.render((t, params)))) == screen(whole)
@@ -0,0 +1,35 @@
+from asciifx.framecache import FrameCache
+
+
+def play(cache, period, cycles, frame_bytes):
+    # the loop's lookups: transition (n - 1, n) for every frame of every cycle
+    hits_per_cycle = []
+    for _ in range(cycles):
+        before = cache.hits
+        for n in range(period):
+            key = ((n - 1) % period, n)
+            if cache.get(*key) is None:
+                cache.put(*key, "x" * frame_bytes)
+        hits_per_cycle.append(cache.hits - before)
+    return hits_per_cycle
+
+
+def test_cycle_that_fits_hits_every_frame_after_the_first_cycle():
+    cache = FrameCache(50, budget=50 * 100)
+    assert play(cache, 50, 3, 100) == [0, 50, 50]
+    assert cache.full == 0
+
+
+def test_cycle_over_budget_keeps_a_prefix_that_hits():
+    # 1000 frames, room for 300: LRU would never hit here
+    cache = FrameCache(1000, budget=300 * 100)
+    hits = play(cache, 1000, 3, 100)
+    assert hits == [0, 300, 300]
+    assert cache.nbytes <= cache.budget
+    assert len(cache.entries) == 300
+
+
+def test_no_budget_caches_nothing():
+    cache = FrameCache(10, budget=0)
+    assert play(cache, 10, 2, 100) == [0, 0]
+    assert not cache.entries
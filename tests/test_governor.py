@@ -0,0 +1,72 @@
+import pytest
+
+from asciifx import governor
+from asciifx.governor import DOWN, HEADROOM, UP, WINDOW, Governor
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def perf_counter(self):
+        return self.t
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(governor, "time", clock)
+    return clock
+
+
+def run(gov, clock, busy, frames):
+    # frames of the given busy seconds; returns the decisions taken meanwhile
+    before = len(gov.decisions)
+    for _ in range(frames):
+        gov.begin()
+        clock.t += busy
+        gov.end()
+    return gov.decisions[before:]
+
+
+def test_steps_down_holds_and_recovers(clock):
+    gov = Governor(30)  # 33.3 ms
+    slow = run(gov, clock, 0.050, 100)
+    assert slow and gov.ups == 0
+    assert [s for _, _, s in slow] == sorted((s for _, _, s in slow), reverse=True)
+    assert slow[0][2] == pytest.approx(DOWN)
+
+    hold = gov.target * (1 + HEADROOM) / 2  # inside the band
+    assert all(s <= slow[-1][2] for _, _, s in run(gov, clock, hold, 2 * WINDOW))
+    low, downs = gov.scale, gov.downs  # the slow frames are out of the window now
+    assert run(gov, clock, hold, 100) == []
+    assert gov.scale == low
+
+    fast = run(gov, clock, 0.010, 400)
+    assert fast and gov.downs == downs
+    assert fast[0][2] == pytest.approx(low * UP)
+    assert gov.scale == 1.0 and gov.low_scale == low
+
+
+def test_waits_a_window_between_decisions(clock):
+    gov = Governor(30)
+    frames = [f for f, _, _ in run(gov, clock, 0.050, 200)]
+    assert all(b - a > WINDOW for a, b in zip(frames, frames[1:]))
+
+
+def test_load_that_follows_the_scale_settles(clock):
+    # busy time proportional to the scale, as with a particle cap: it has to
+    # come to rest inside the band instead of going up and down
+    gov = Governor(30)
+    for _ in range(1000):
+        gov.begin()
+        clock.t += 0.060 * gov.scale
+        gov.end()
+    assert gov.ups == 0
+    settled = len(gov.decisions)
+    for _ in range(500):
+        gov.begin()
+        clock.t += 0.060 * gov.scale
+        gov.end()
+    assert len(gov.decisions) == settled
+    assert gov.target * HEADROOM <= 0.060 * gov.scale <= gov.target
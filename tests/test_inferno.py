@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import inferno
+
+SIZES = [(20, 8), (80, 24), (151, 47)]
+TIMES = [0.0, 0.37, 5.0, 123.4]
+PARAMS = (0.06, 1.2, 0.25)  # swirl, spiral strength, outward speed
+
+
+@pytest.mark.parametrize("use_true", [True, False])
+@pytest.mark.parametrize("size", SIZES)
+def test_numpy_backend_matches_the_loop(size, use_true):
+    base = inferno.scale_art_to_terminal(*size)
+    art = inferno.art_to_array(base)
+    for t in TIMES:
+        assert (inferno.render_rows_numpy(art, t, use_true, *PARAMS) ==
+                inferno.render_rows_loop(base, t, use_true, *PARAMS))
+
+
+def test_bands_match_the_whole_frame():
+    base = inferno.scale_art_to_terminal(80, 24)
+    art = inferno.art_to_array(base)
+    glyphs, colors = inferno.render_rows_loop(base, 1.5, True, *PARAMS)
+    band = inferno.render_rows_numpy(art, 1.5, True, *PARAMS, rows=(5, 12))
+    assert band == (glyphs[5:12], colors[5:12])
+
+
+def test_unknown_backend_is_refused(monkeypatch):
+    monkeypatch.delitem(inferno.BACKENDS, "numpy")  # as without numpy
+    with pytest.raises(ValueError, match="numpy"):
+        inferno.run_animation(backend="numpy", session=object())
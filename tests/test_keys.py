@@ -0,0 +1,73 @@
+import pytest
+
+from asciifx.keys import QUIT, CursesKeys, ScriptedKeys, parse
+
+
+@pytest.mark.parametrize("text, keys", [
+    ("+-c", ["+", "-", "c"]),
+    ("\033", ["esc"]),
+    ("q", ["q"]),
+    ("\033[A\033[B\033[C\033[D", ["up", "down", "right", "left"]),
+    ("\033OA\033OD", ["up", "left"]),
+    ("\033[1;5C", ["right"]),  # Ctrl+Right
+    (" \r", ["space", "enter"]),
+    ("\033\033", ["esc", "esc"]),
+])
+def test_parse(text, keys):
+    assert parse(text) == keys
+
+
+@pytest.mark.parametrize("text", [
+    "\033[H",      # Home
+    "\033[F",      # End
+    "\033[5~",     # PgUp
+    "\033[6~",     # PgDn
+    "\033[15~",    # F5
+    "\033OP",      # F1
+    "\033x",       # Alt+x
+    "\033[",       # cut short
+    "\033[1;",     # cut short
+])
+def test_other_sequences_do_not_quit(text):
+    assert not any(k in QUIT for k in parse(text))
+    assert parse(text) == []
+
+
+def test_sequences_are_swallowed_whole():
+    assert parse("\033[5~+\033OP]") == ["+", "]"]
+
+
+def test_scripted_keys():
+    keys = ScriptedKeys("1:+,1:c,3:q")
+    assert keys.poll() == []
+    assert keys.poll() == ["+", "c"]
+    assert keys.poll() == []
+    assert keys.poll() == ["q"] and keys.quit
+
+
+class Window:
+    # getch() of a nodelay curses window: the queued codes, then -1
+    def __init__(self, codes):
+        self.codes = list(codes)
+
+    def nodelay(self, flag):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+    def getch(self):
+        return self.codes.pop(0) if self.codes else -1
+
+
+def test_curses_keys_swallow_undecoded_sequences():
+    curses = pytest.importorskip("curses")
+    keys = CursesKeys(Window([27, *b"[1;5A", ord("+"), curses.KEY_UP, 27, *b"[5~", ord("]")]))
+    assert keys.poll() == ["up", "+", "up", "]"]  # Ctrl+Up decodes as up, PgUp is dropped
+    assert not keys.quit
+
+
+def test_curses_keys_esc_quits():
+    pytest.importorskip("curses")
+    keys = CursesKeys(Window([ord("+"), 27]))
+    assert keys.poll() == ["+", "esc"] and keys.quit
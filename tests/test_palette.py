@@ -0,0 +1,20 @@
+import pytest
+
+from asciifx.palette import MAX_ERROR, ColorTable
+
+
+@pytest.mark.parametrize("mode", ["truecolor", "256"])
+def test_default_table_error_within_bound(mode):
+    assert ColorTable(mode).max_error() <= MAX_ERROR[mode]
+
+
+def test_finer_table_is_more_accurate():
+    assert ColorTable("truecolor", 512, 32, 32).max_error() < ColorTable("truecolor").max_error()
+
+
+@pytest.mark.parametrize("mode", ["truecolor", "256"])
+def test_lookup_matches_filled_entry(mode):
+    table = ColorTable(mode)
+    i = table.index(0.3, 0.5, 0.75)
+    assert table.lookup(0.3, 0.5, 0.75) == table.entry(i)
+    assert table.lookup(1.3, 0.5, 0.75) == table.entry(i)  # hue wraps
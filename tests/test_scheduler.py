@@ -0,0 +1,27 @@
+from asciifx.scheduler import FrameScheduler
+
+
+class Clock:
+    options = {}
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.t += seconds + 0.001  # oversleep by 1 ms
+
+
+def test_jitter_mean_counts_late_frames_that_slept():
+    clock = Clock()
+    sched = FrameScheduler(clock, 0.03)
+    for i in range(40):
+        clock.t += 0.05 if i % 4 == 0 else 0.01  # every fourth frame is late
+        sched.wait()
+    assert sched.missed
+    assert sched.jitter_samples == sched.frames
+    mean = sched.jitter_total / sched.jitter_samples
+    assert mean <= sched.jitter_max + 1e-12
+    assert abs(mean - 0.001) < 1e-9
@@ -0,0 +1,104 @@
+import random
+import re
+
+from asciifx.screen import ScreenBuffer, move_to
+
+RED, GREEN, BLUE = "\033[31m", "\033[32m", "\033[34m"
+TOKEN = re.compile(r"\033\[(\d+);(\d+)H|\033\[H|\033\[2J|(\033\[[0-9;]*m)|(\n)|(.)", re.S)
+
+
+class Terminal:
+    # just enough of one to show ScreenBuffer output: cursor moves, SGR,
+    # newlines and characters; cells are (glyph, color), spaces uncolored
+    def __init__(self, width, height):
+        self.cells = [[(" ", "")] * width for _ in range(height)]
+        self.x = self.y = 0
+        self.color = ""
+
+    def feed(self, text):
+        for m in TOKEN.finditer(text):
+            row, col, sgr, newline, ch = m.groups()
+            if row:
+                self.y, self.x = int(row) - 1, int(col) - 1
+            elif m.group() == "\033[H":
+                self.x = self.y = 0
+            elif m.group() == "\033[2J":
+                self.cells = [[(" ", "")] * len(r) for r in self.cells]
+            elif sgr:
+                self.color = "" if sgr in ("\033[0m", "\033[39m") else sgr
+            elif newline:
+                self.x, self.y = 0, self.y + 1
+            else:
+                self.cells[self.y][self.x] = (ch, self.color if ch != " " else "")
+                self.x += 1
+
+
+def shown(glyphs, colors):
+    return [[(g, c if g != " " else "") for g, c in zip(*row)] for row in zip(glyphs, colors)]
+
+
+def diff(old, new):
+    buf = ScreenBuffer()
+    buf.render(*old)
+    return buf.diff_frame(*new)
+
+
+def frame(text, color):
+    glyphs = [list(row) for row in text]
+    return glyphs, [[color] * len(row) for row in glyphs]
+
+
+def test_diff_applied_to_the_previous_frame_gives_the_new_one():
+    rng = random.Random(7)
+    width, height = 30, 8
+    glyphs = [[" "] * width for _ in range(height)]
+    colors = [[""] * width for _ in range(height)]
+    frames = []
+    for _ in range(200):
+        for _ in range(rng.randint(0, 25)):
+            x, y = rng.randrange(width), rng.randrange(height)
+            glyphs[y][x] = rng.choice(" *+o")
+            colors[y][x] = rng.choice(["", RED, GREEN, BLUE])
+        frames.append(([list(r) for r in glyphs], [list(r) for r in colors]))
+    for f0, f1 in zip(frames, frames[1:]):
+        term = Terminal(width, height)
+        term.feed(ScreenBuffer().full_frame(*f0))
+        term.feed(diff(f0, f1))
+        assert term.cells == shown(*f1)
+
+
+def test_short_unchanged_gaps_are_bridged():
+    old = frame(["a   c           "], RED)
+    new = frame(["X   Y           "], RED)
+    data = diff(old, new)
+    assert data.count("H") == 1  # one cursor move for both changes
+    assert data.startswith(move_to(0, 0))
+    term = Terminal(16, 1)
+    term.feed(ScreenBuffer().full_frame(*old) + data)
+    assert term.cells == shown(*new)
+
+
+def test_bridged_cells_keep_their_color():
+    old = ([list("abc")], [[RED, GREEN, RED]])
+    new = ([list("XbY")], [[RED, GREEN, RED]])
+    data = diff(old, new)
+    assert data == move_to(0, 0) + RED + "X" + GREEN + "b" + RED + "Y" + "\033[0m"
+
+
+def test_long_unchanged_gaps_get_a_cursor_move():
+    old = frame(["a   bcd        e"], RED)
+    new = frame(["X   bcd        Y"], RED)
+    assert diff(old, new).count("H") == 2
+
+
+def test_color_only_change_is_written():
+    old = frame(["abc"], RED)
+    new = (old[0], [[RED, GREEN, RED]])
+    data = diff(old, new)
+    assert data == move_to(1, 0) + GREEN + "b" + "\033[0m"
+
+
+def test_spaces_with_other_colors_are_unchanged():
+    old = frame(["a  b"], RED)
+    new = (old[0], [[RED, GREEN, BLUE, RED]])
+    assert diff(old, new) == ""
@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from asciifx.spiral import SpiralRaster, arc_length_samples, circle_radius
+
+SQUASH = 0.55
+SIZES = [(80, 24), (120, 50), (300, 90)]
+PHASES = [0.0, 0.05, 1.234, -2.5, 40.0]
+MAX_DIFF = 0.001  # fraction of cells allowed to differ (rounding at a cell edge)
+
+
+def direct(angles, radii, cells, phase, width, height, dedupe=False):
+    # the per-sample cos/sin path SpiralRaster replaces
+    glyphs = [[" "] * width for _ in range(height)]
+    colors = [[""] * width for _ in range(height)]
+    cx, cy = width // 2, height // 2
+    last = None
+    for a, r, cell in zip(angles, radii, cells):
+        sx = int(round(cx + r * math.cos(a + phase)))
+        sy = int(round(cy + r * math.sin(a + phase) * SQUASH))
+        if dedupe:
+            if (sx, sy) == last:
+                continue
+            last = (sx, sy)
+        if 0 <= sx < width and 0 <= sy < height:
+            glyphs[sy][sx], colors[sy][sx] = cell
+    return glyphs, colors
+
+
+def curves(width, height):
+    max_radius = circle_radius(width, height, SQUASH)
+    # spiral4: arc-length samples over 30 turns; spiral5: 4000 even samples
+    ts = arc_length_samples(30, max_radius)
+    yield [2 * math.pi * 30 * t for t in ts], [t * max_radius for t in ts], ts
+    ts = [i / 4000 for i in range(4000)]
+    yield [2 * math.pi * 12 * t for t in ts], [t * max_radius for t in ts], ts
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+@pytest.mark.parametrize("dedupe", [False, True])
+def test_raster_matches_direct_trig(width, height, dedupe):
+    for angles, radii, ts in curves(width, height):
+        cells = [("*#@"[int(t * 3) % 3], f"c{int(t * 10)}") for t in ts]
+        raster = SpiralRaster(angles, width, height, SQUASH)
+        for phase in PHASES:
+            glyphs = [[" "] * width for _ in range(height)]
+            colors = [[""] * width for _ in range(height)]
+            raster.plot(phase, radii, cells, glyphs, colors, dedupe=dedupe)
+            want_glyphs, want_colors = direct(angles, radii, cells, phase, width, height, dedupe)
+            differ = sum(g != wg or c != wc
+                         for row, crow, wrow, wcrow in zip(glyphs, colors, want_glyphs, want_colors)
+                         for g, c, wg, wc in zip(row, crow, wrow, wcrow))
+            assert differ <= MAX_DIFF * width * height, (phase, differ)
+
+
+def test_arc_length_samples_leave_no_gaps():
+    max_radius = 40
+    ts = arc_length_samples(10, max_radius)
+    k = 2 * math.pi * 10
+    points = [(t * max_radius * math.cos(k * t), t * max_radius * math.sin(k * t)) for t in ts]
+    assert max(math.dist(a, b) for a, b in zip(points, points[1:])) <= 1.0 + 1e-6
@@ -0,0 +1,47 @@
+from asciifx.session import session_from_argv
+from asciifx.timestep import FixedStep
+
+
+class Clock:
+    options = {}
+    flags = frozenset()
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+
+def test_steps_follow_the_clock_exactly():
+    clock = Clock()
+    step = FixedStep(clock, 0.03)
+    total = 0
+    for _ in range(100):
+        total += step.advance()
+        clock.t += 0.05  # render at 20 FPS, simulate at 33.3 Hz
+    total += step.advance()
+    assert total == int(clock.t / 0.03 + 1e-6)
+    assert abs(total * 0.03 + step.acc - clock.t) < 1e-9
+
+
+def test_substeps_are_capped_and_the_rest_carried_over():
+    clock = Clock()
+    step = FixedStep(clock, 0.01, max_steps=5)
+    step.advance()
+    clock.t = 0.08
+    assert step.advance() == 5
+    assert not step.render_due()  # still behind: skip drawing
+    assert step.advance() == 3
+    assert step.render_due()
+    assert step.lag_dropped == 0.0
+
+
+def test_options_come_from_the_session_argv():
+    session = session_from_argv(["--headless=20x5", "--frames=1", "--sim-hz=50",
+                                 "--max-substeps=3", "--interpolate"])
+    step = FixedStep.for_session(session, 0.03)
+    assert step.dt == 1 / 50
+    assert step.max_steps == 3
+    assert step.interpolate
+    assert not FixedStep.for_session(session_from_argv(["--headless=20x5"]), 0.03).interpolate
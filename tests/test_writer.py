@@ -0,0 +1,59 @@
+import threading
+
+from asciifx.writer import FrameWriter, write_control
+
+
+class GatedStream:
+    # a terminal that takes its first write only when released
+    def __init__(self):
+        self.out = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.entered.set()
+        self.release.wait(5)
+        self.out.append(data)
+
+    def flush(self):
+        pass
+
+
+def test_superseded_frame_keeps_its_control_output():
+    stream = GatedStream()
+    writer = FrameWriter(stream, depth=1)
+    writer.write("frame1")
+    writer.end_frame()
+    assert stream.entered.wait(5)  # frame1 is being written
+    write_control("\033[2J", writer)
+    writer.write("frame2")
+    writer.end_frame()
+    writer.write("frame3")
+    writer.end_frame()  # supersedes frame2
+    stream.release.set()
+    writer.close()
+    assert writer.superseded == 1
+    assert "".join(stream.out) == "frame1\033[2Jframe3"
+
+
+def test_frame_written_in_order_when_not_superseded():
+    stream = GatedStream()
+    stream.release.set()
+    writer = FrameWriter(stream, depth=2)
+    writer.write("a")
+    write_control("\033[?25l", writer)
+    writer.write("b")
+    writer.end_frame()
+    writer.close()
+    assert "".join(stream.out) == "a\033[?25lb"
+
+
+def test_write_control_on_a_plain_stream():
+    class Plain:
+        out = ""
+
+        def write(self, data):
+            self.out += data
+    stream = Plain()
+    write_control("\033[2J", stream)
+    assert stream.out == "\033[2J"
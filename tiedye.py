@@ -8,108 +8,35 @@ Enhancements:
 - Preserves dynamic color swirl and scaling.
 """
 
-import os, sys, time, math, shutil, signal
+import sys, math, signal
 
-# -------------------------
-# PRE-RENDERED ASCII ART (same as original)
-# -------------------------
-ART = r"""
-........................................................................................................
-...........................................:::::::=*#%@@%#*+=:..........................................
-.....................................:::::::-=+*#%@@@@@@@@@@@@%#*+=-:...................................
-..................................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@%#*+=-::..............................
-...............................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::.........................
-.............................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::...................
-...........................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::...............
-.........................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::...........
-.......................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-::........
-......................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:......
-....................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:....
-...................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=-:
-..................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#*+=
-.................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%#
-................:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-...............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-..............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
-.............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%
-............:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@
-...........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@
-..........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-........:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.......:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-......:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-.....:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-....:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@
-...:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-..:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-:::::::-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.:::::::-=+*#%@@@@@@@@@@@%%%%%%%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-..:::::::-=+*#%@@@@@%*=-:......:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-...:::::::-=+*#%@@#=:..............:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-....:::::::-=+*#*=:....................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-.....:::::::-=+*=-:......................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@
-......:::::::-=+:-:........................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@
-.......:::::::-:............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@
-........:::::::-:.............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@
-.........:::::::::..............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@
-..........:::::::::...............................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@
-...........::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@
-............:::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@
-.............:::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@
-..............::::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@@@@
-...............:::::::::::::::::.................................:-=+*#%@@@@@@@@@@@%@@@@@@@@@@@@@@@@@@@@@@
-................::::::::::::::::::.................................:-=+*#%@@@@@%@@@@@@@@@@@@@@@@@@@@@@@@@
-.................:::::::::::::::::::::.................................:-=+*#%@@%@@@@@@@@@@@@@@@@@@@@@@@@@
-..................::::::::::::::::::::::.................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@@@@
-....................:::::::::::::::::::::::................................:-=+*#%@@@@@@@@@@@@@@@@@@@@@@@
-........................................................................................................
-"""
+from asciifx.art import load_art, scale_art
+from asciifx.bands import pool_for
+from asciifx.encoder import encode_frame
+from asciifx.keys import count_key, speed_key
+from asciifx.palette import color_table
+from asciifx.polar import polar_grid
+from asciifx.scheduler import FrameScheduler
+from asciifx.session import session_from_argv
+from asciifx.writer import write_control
 
 # -------------------------
 # Utility & color functions
 # -------------------------
-def supports_truecolor():
-    ct = os.environ.get("COLORTERM", "").lower()
-    return "truecolor" in ct or "24bit" in ct or True
-
-def hide_cursor(): sys.stdout.write("\033[?25l")
-def show_cursor(): sys.stdout.write("\033[?25h")
+def hide_cursor(): write_control("\033[?25l")
+def show_cursor(): write_control("\033[?25h")
 def move_cursor_home(): sys.stdout.write("\033[H")
-def clear_screen(): sys.stdout.write("\033[2J")
+def clear_screen(): write_control("\033[2J")
 def flush(): sys.stdout.flush()
 
-def hsv_to_rgb(h, s, v):
-    i = int(h * 6)
-    f = h * 6 - i
-    p, q, t = v * (1 - s), v * (1 - s * f), v * (1 - s * (1 - f))
-    i = i % 6
-    if i == 0: r, g, b = v, t, p
-    elif i == 1: r, g, b = q, v, p
-    elif i == 2: r, g, b = p, v, t
-    elif i == 3: r, g, b = p, q, v
-    elif i == 4: r, g, b = t, p, v
-    else: r, g, b = v, p, q
-    return int(r*255), int(g*255), int(b*255)
-
-def rgb_to_truecolor_seq(r,g,b): return f"\033[38;2;{r};{g};{b}m"
-
 # -------------------------
 # Art setup
 # -------------------------
-art_lines = [line.rstrip("\n") for line in ART.splitlines() if line.strip("\n") != ""]
-orig_h, orig_w = len(art_lines), max(len(line) for line in art_lines)
-for i in range(len(art_lines)):
-    art_lines[i] = art_lines[i].ljust(orig_w)
+# the same vortex art as inferno, precompiled (asciifx/art.py)
+orig_h, orig_w = len(load_art()[0]), len(load_art()[0][0])
 
 CHAR_ASPECT = 0.8  # slightly taller to fill the bottom better
 
-def get_terminal_size():
-    cols, rows = shutil.get_terminal_size((80, 24))
-    return cols, rows
-
 def scale_art_to_terminal(cols, rows):
     target_w = max(20, cols)
     art_ratio = orig_h / orig_w
@@ -117,80 +44,140 @@ def scale_art_to_terminal(cols, rows):
     if target_h > rows:
         target_h = rows
         target_w = max(20, int(target_h / (art_ratio * CHAR_ASPECT)))
-    scaled = []
-    for y in range(target_h):
-        sy = int((y / max(1, target_h - 1)) * (orig_h - 1))
-        row = []
-        for x in range(target_w):
-            sx = int((x / max(1, target_w - 1)) * (orig_w - 1))
-            row.append(art_lines[sy][sx])
-        scaled.append(row)
-    return scaled
+    return scale_art(target_w, target_h, "floor")
 
 # -------------------------
 # Animation
 # -------------------------
-def run_animation():
-    use_true = supports_truecolor()
-    cols, rows = get_terminal_size()
-    scaled = scale_art_to_terminal(cols, rows)
+# rows=(y0, y1) renders only that band of the frame (see render_band)
+def render_rows(scaled, t, swirl_speed, spiral_strength, outward_speed, arms=3,
+                mode="truecolor", rows=None):
     H, W = len(scaled), len(scaled[0])
-    cx, cy = (W - 1) / 2.0, (H - 1) / 2.0
-    max_r = math.hypot(cx, cy)
-    arms = 3  # triple-arm spiral
+    grid = polar_grid(W, H)
+    cx, cy, max_r = grid.cx, grid.cy, grid.max_r
+    table = color_table(mode)
+    y0, y1 = rows or (0, H)
+    glyph_rows, color_rows = [], []
+    for y in range(y0, y1):
+        glyphs, colors = [], []
+        rnorm_row, angle_row = grid.rnorm[y], grid.angle[y]
+        for x in range(W):
+            r, ang = rnorm_row[x], angle_row[x]
+            r_out = (r - outward_speed * t) % 1.0
+            ch = " "
+            for k in range(arms):
+                arm_angle = ang + (k * 2 * math.pi / arms)
+                rot = swirl_speed * t + r_out * spiral_strength
+                new_ang = arm_angle - rot
+                rx_new = r_out * max_r * math.cos(new_ang)
+                ry_new = r_out * max_r * math.sin(new_ang)
+                x_disp = int(round(cx + rx_new))
+                y_disp = int(round(cy + ry_new))
+                if 0 <= x_disp < W and 0 <= y_disp < H:
+                    c = scaled[y_disp][x_disp]
+                    if c != " ":
+                        ch = c
+            if ch == " ":
+                glyphs.append(" ")
+                colors.append("")
+                continue
+            hue = ((ang / (2*math.pi)) + (t*0.08) + (r_out*2.5)) % 1.0
+            sat = 0.9
+            val = 0.8
+            glyphs.append(ch)
+            colors.append(table.lookup(hue, sat, val))
+        glyph_rows.append(glyphs)
+        color_rows.append(colors)
+    return glyph_rows, color_rows
+
+def render_band(scaled, frame, y0, y1):
+    # one band of the frame, encoded; runs in an asciifx.bands worker
+    t, params = frame
+    glyph_rows, color_rows = render_rows(scaled, t, *params, rows=(y0, y1))
+    return encode_frame(glyph_rows, color_rows)
+
+def run_animation(session=None):
+    session = session or session_from_argv()
+    prof = session.profiler
+    cols, rows = session.size((80, 24))
+    scaled = scale_art_to_terminal(cols, rows)
 
     FPS = 20.0
     delay = 1.0 / FPS
     swirl_speed = 0.07
     spiral_strength = 1.3
     outward_speed = 0.25
+    arms = 3  # triple-arm spiral
+    mode = "truecolor"
+    sched = FrameScheduler.for_session(session, delay)
+    keys = session.keys
+    speed = 1.0  # + / - keys; [ / ] arms; c switches between truecolor and 256 colors
+    t = last = 0.0
+
+    # --workers=N: bands rendered by worker processes (started before the
+    # session's writer thread)
+    pool = pool_for(session, render_band)
+    if pool:
+        pool.setup(scaled, len(scaled[0]), len(scaled))
 
-    time0 = time.time()
-    hide_cursor()
-    clear_screen()
     try:
-        while True:
-            t = time.time() - time0
-            move_cursor_home()
-            lines = []
-            for y in range(H):
-                parts = []
-                for x in range(W):
-                    rx, ry = x - cx, y - cy
-                    r = math.hypot(rx, ry) / max_r
-                    ang = math.atan2(ry, rx)
-                    r_out = (r - outward_speed * t) % 1.0
-                    ch = " "
-                    for k in range(arms):
-                        arm_angle = ang + (k * 2 * math.pi / arms)
-                        rot = swirl_speed * t + r_out * spiral_strength
-                        new_ang = arm_angle - rot
-                        rx_new = r_out * max_r * math.cos(new_ang)
-                        ry_new = r_out * max_r * math.sin(new_ang)
-                        x_disp = int(round(cx + rx_new))
-                        y_disp = int(round(cy + ry_new))
-                        if 0 <= x_disp < W and 0 <= y_disp < H:
-                            c = scaled[y_disp][x_disp]
-                            if c != " ":
-                                ch = c
-                    if ch == " ":
-                        parts.append(" ")
-                        continue
-                    hue = ((ang / (2*math.pi)) + (t*0.08) + (r_out*2.5)) % 1.0
-                    sat = 0.9
-                    val = 0.8
-                    rcol, gcol, bcol = hsv_to_rgb(hue, sat, val)
-                    seq = rgb_to_truecolor_seq(rcol, gcol, bcol)
-                    parts.append(f"{seq}{ch}\033[0m")
-                lines.append("".join(parts))
-            sys.stdout.write("\n".join(lines))
-            flush()
-            time.sleep(delay)
+        with session:
+            hide_cursor()
+            clear_screen()
+            while True:
+                if prof:
+                    prof.frame()
+                if keys:
+                    for key in keys.poll():
+                        speed = speed_key(speed, key)
+                        arms = count_key(arms, key, 1, 8)
+                        if key == "c":
+                            mode = "256" if mode == "truecolor" else "truecolor"
+                now = session.now()
+                t += (now - last) * speed
+                last = now
+                params = (swirl_speed, spiral_strength, outward_speed, arms, mode)
+
+                # Handle dynamic resizing
+                new_cols, new_rows = session.size((80, 24))
+                if new_cols != cols or new_rows != rows:
+                    cols, rows = new_cols, new_rows
+                    scaled = scale_art_to_terminal(cols, rows)
+                    if pool:
+                        pool.setup(scaled, len(scaled[0]), len(scaled))
+                    clear_screen()
+                move_cursor_home()
+                if pool:
+                    bands = pool.render((t, params))  # rasterized and encoded by the workers
+                    if prof:
+                        prof.lap("raster")
+                    text = "\n".join(bands)
+                else:
+                    glyph_rows, color_rows = render_rows(scaled, t, *params)
+                    if prof:
+                        prof.lap("raster")
+                    text = encode_frame(glyph_rows, color_rows)
+                if prof:
+                    prof.lap("encode")
+                sys.stdout.write(text)
+                flush()
+                if prof:
+                    prof.lap("write")
+                    prof.end_frame(cols)
+                if not session.end_frame():
+                    break
+                sched.wait()
+            show_cursor()
     except KeyboardInterrupt:
         move_cursor_home()
         clear_screen()
         show_cursor()
         print("Exited gracefully.")
+    finally:
+        if pool:
+            pool.close()
+    if "stats" in session.flags:
+        print(sched.summary())
 
 if __name__ == "__main__":
     run_animation()